@@ -22,9 +22,15 @@ class TradingStrategy(Strategy):
     def data(self):
         return self.data_list
 
+    @property
+    def risk(self):
+        # 3-month trailing stops, which a backtest driver may track incrementally and pass as data["risk"]
+        return {f"stop_{ticker}": ("STOP_LOSS", ticker, 63, 0.05) for ticker in self.tickers}
+
     def run(self, data):
         # Access OHLCV data
         ohlcv = data["ohlcv"]
+        risk = data.get("risk")
         if len(ohlcv) < 1:  # Ensure sufficient data for 200-day MA
             return TargetAllocation({ticker: 0.1 for ticker in self.tickers})
 
@@ -53,16 +59,22 @@ class TradingStrategy(Strategy):
 
             # Apply profit-taking rule
             one_month_return = (closes[-1] / closes[-21] - 1) if len(closes) >= 21 else 0  # Approx 1 month
-            rsi = RSI(ticker, ohlcv, 14)[-1] if RSI(ticker, ohlcv, 14) else 50
+            rsi_values = RSI(ticker, ohlcv, 14)
+            rsi = rsi_values[-1] if rsi_values else 50
             if one_month_return > 0.30 or rsi > 80:
                 momentum_scores[ticker] *= 0.85  # Reduce exposure by 15% (trim position)
 
             # Apply stop-loss rule
-            peak_price = max(closes[-63:])  # Last 3 months peak
-            drop_from_peak = (peak_price - closes[-1]) / peak_price
-            sma_50 = VWAP(ticker, ohlcv, 10)[-1] if VWAP(ticker, ohlcv, 10) else closes[-1]
-            sma_200 = VWAP(ticker, ohlcv, 200)[-1] if VWAP(ticker, ohlcv, 200) else closes[-1]
-            if drop_from_peak > 0.05 or sma_50 < sma_200:
+            if risk:
+                stopped = risk[f"stop_{ticker}"]
+            else:
+                peak_price = max(closes[-63:])  # Last 3 months peak
+                stopped = (peak_price - closes[-1]) / peak_price > 0.05
+            vwap_10 = VWAP(ticker, ohlcv, 10)
+            vwap_200 = VWAP(ticker, ohlcv, 200)
+            sma_50 = vwap_10[-1] if vwap_10 else closes[-1]
+            sma_200 = vwap_200[-1] if vwap_200 else closes[-1]
+            if stopped or sma_50 < sma_200:
                 momentum_scores[ticker] = 0  # Temporarily remove stock
 
         # Adjust exposure based on momentum score
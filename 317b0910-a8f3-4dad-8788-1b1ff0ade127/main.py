@@ -5,6 +5,7 @@ from surmount.logging import log
 class TradingStrategy(Strategy):
     def __init__(self):
         self.tickers = ["MRNA", "BNTX", "ISRG", "TDOC", "VRTX", "UNH"]
+        self.trailing_stop = 0.82  # Exit below this fraction of the 30-day high
 
     @property
     def interval(self):
@@ -14,8 +15,18 @@ class TradingStrategy(Strategy):
     def assets(self):
         return self.tickers
 
+    @property
+    def lookback(self):
+        return 126  # Longest window used below (6-month momentum/STDEV)
+
+    @property
+    def risk(self):
+        # Trailing stops off the 30-day high, tracked incrementally by a backtest driver and passed as data["risk"]
+        return {f"stop_{ticker}": ("STOP_LOSS", ticker, 30, 1 - self.trailing_stop, "high") for ticker in self.tickers}
+
     def run(self, data):
         ohlcv = data["ohlcv"]
+        risk = data.get("risk")
         allocation = {ticker: 0 for ticker in self.tickers}
         momentum_scores = {}
         
@@ -25,7 +36,8 @@ class TradingStrategy(Strategy):
 
             close_prices = [day[ticker]["close"] for day in ohlcv[-126:]]
             returns = (close_prices[-1] / close_prices[0]) - 1
-            volatility = STDEV(ticker, ohlcv, 126)[-1] if STDEV(ticker, ohlcv, 126) else 1
+            stdev = STDEV(ticker, ohlcv, 126)
+            volatility = stdev[-1] if stdev else 1
             
             momentum_scores[ticker] = returns / volatility
         
@@ -48,8 +60,12 @@ class TradingStrategy(Strategy):
 
         # Stop-Loss Rule: Remove stock if it drops >18% from its recent high
         for ticker in self.tickers:
-            recent_high = max([day[ticker]["high"] for day in ohlcv[-30:]])
-            if ohlcv[-1][ticker]["close"] < recent_high * 0.82:
+            if risk:
+                stopped = risk[f"stop_{ticker}"]
+            else:
+                recent_high = max([day[ticker]["high"] for day in ohlcv[-30:]])
+                stopped = ohlcv[-1][ticker]["close"] < recent_high * self.trailing_stop
+            if stopped:
                 allocation[ticker] = 0  # Remove stock from portfolio
 
         # Defensive Rotation: Shift towards UNH when biotech underperforms
@@ -10,6 +10,8 @@ class TradingStrategy(Strategy):
         self.tickers = ["ICLN", "NEE", "FSLR", "PLUG", "ENPH", "ALB", "TSLA"]
         # Add P/B ratio as extra data source
         self.data_list = [Ratios(ticker) for ticker in self.tickers]
+        # Data keys never change, so resolve them once instead of on every bar
+        self.ratio_keys = {tuple(d)[1]: tuple(d) for d in self.data_list if tuple(d)[0] == "ratios"}
 
     @property
     def interval(self):
@@ -41,12 +43,10 @@ class TradingStrategy(Strategy):
         
 
         # Get P/B ratios
-        for d in self.data_list:
-            if tuple(d)[0] == "ratios":
-                ticker = tuple(d)[1]
-                vals = data[tuple(d)]
-                if vals and "priceToBook" in vals[-1]:
-                    pb_ratios[ticker] = vals[-1]["priceToBook"]
+        for ticker, key in self.ratio_keys.items():
+            vals = data[key]
+            if vals and "priceToBook" in vals[-1]:
+                pb_ratios[ticker] = vals[-1]["priceToBook"]
 
         # Compute P/B median excluding ICLN
         pb_values = [pb_ratios[t] for t in self.tickers if t != "ICLN" and pb_ratios[t] is not None]
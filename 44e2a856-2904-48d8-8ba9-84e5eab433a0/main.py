@@ -7,6 +7,7 @@ class TradingStrategy(Strategy):
     def __init__(self):
         self.tickers = ["SMR", "BWXT", "LEU", "CEG", "VST", "OKLO", "CCJ", "URA"]
         self.tradtick = ["SMR", "BWXT", "LEU", "CEG", "VST", "OKLO", "CCJ"]
+        self.profit_take = 0.4  # Quarterly gain that halves a position
 
     @property
     def interval(self):
@@ -20,15 +21,30 @@ class TradingStrategy(Strategy):
     def data(self):
         return []
 
+    @property
+    def signals(self):
+        # URA 1-month return, which a backtest driver may precompute and pass as data["signals"]
+        return {"ura_return_21": ("RETURN", "URA", 21)}
+
+    @property
+    def risk(self):
+        # 3-month trailing stops, tracked incrementally by a backtest driver and passed as data["risk"]
+        return {f"stop_{ticker}": ("STOP_LOSS", ticker, 63, 0.18) for ticker in self.tradtick}
+
     def run(self, data):
         ohlcv = data["ohlcv"]
         allocations = {}
         weights = {ticker: 1 for ticker in self.tradtick}
-        index = [x["URA"]["close"] for x in ohlcv if "URA" in x]
-        if len(index) > 1:
-            incurrent = index[-1]
-            inmonth_ago = index[-21]
-            inmonth_return = (incurrent - inmonth_ago) / inmonth_ago
+        signals = data.get("signals")
+        risk = data.get("risk")
+        if signals:
+            inmonth_return = signals["ura_return_21"]
+        else:
+            index = [x["URA"]["close"] for x in ohlcv if "URA" in x]
+            if len(index) > 1:
+                incurrent = index[-1]
+                inmonth_ago = index[-21]
+                inmonth_return = (incurrent - inmonth_ago) / inmonth_ago
 
         # Edge case: Not enough data
         '''if len(index) < 1:
@@ -47,14 +63,17 @@ class TradingStrategy(Strategy):
             current = prices[-1]
             month_ago = prices[-21]
             quarter_ago = prices[-63]
-            peak = max(prices[-63:])
 
             # Monthly performance
             month_return = (current - month_ago) / month_ago
             # Quarterly performance
             quarter_return = (current - quarter_ago) / quarter_ago
             # Peak drawdown from last 3 months
-            drawdown = (current - peak) / peak
+            if risk:
+                stopped = risk[f"stop_{ticker}"]
+            else:
+                peak = max(prices[-63:])
+                stopped = (current - peak) / peak < -0.18
 
             # Adaptive overweighting based on CCJ price
             if ticker == "CCJ" and inmonth_return > 0.10:
@@ -62,11 +81,11 @@ class TradingStrategy(Strategy):
                 weights["LEU"] += 1
 
             # Profit-taking rule: Reduce allocation if up >40% in a quarter
-            if quarter_return > 0.4:
+            if quarter_return > self.profit_take:
                 weights[ticker] *= 0.5
 
             # Stop-loss: reduce if down >18% from peak
-            if drawdown < -0.18:
+            if stopped:
                 weights[ticker] *= 0.5
 
         # Normalize weights to sum <= 1
@@ -8,6 +8,9 @@ class TradingStrategy(Strategy):
         self.btc_ticker = "BTC-USD"
         self.data_list = []
         self.weights = {"COIN": 0.1, "MSTR": 0.1, "NVDA": 0.1, "AMD": 0.1, "BITO": 0.1}
+        self.drawdown_stop = 0.05  # Drop from peak that zeroes a position
+        self.peak_price = {}  # Running all-time high close per ticker
+        self.peak_date = None  # Date of the newest bar folded into self.peak_price
 
     @property
     def interval(self):
@@ -21,20 +24,46 @@ class TradingStrategy(Strategy):
     def data(self):
         return self.data_list
 
+    @property
+    def lookback(self):
+        return 200  # 200-day BTC VWAP; peaks are tracked in self.peak_price
+
+    @property
+    def signals(self):
+        # Regime inputs a backtest driver may precompute and pass as data["signals"]
+        return {"btc_vwap_50": ("VWAP", self.btc_ticker, 50), "btc_vwap_200": ("VWAP", self.btc_ticker, 200)}
+
     def run(self, data):
         ohlcv = data["ohlcv"]
         allocation = {ticker: 0 for ticker in self.tickers}
+
+        # Fold every bar newer than the last one seen into the all-time peaks (the whole
+        # history on the first call), so bars skipped between calls still count
+        newer = 0
+        while newer < len(ohlcv) and (self.peak_date is None or ohlcv[-1 - newer][self.btc_ticker]["date"] > self.peak_date):
+            newer += 1
+        for i in range(len(ohlcv) - newer, len(ohlcv)):
+            for ticker in self.tickers:
+                close = ohlcv[i][ticker]["close"]
+                self.peak_price[ticker] = max(self.peak_price.get(ticker, close), close)
+        if ohlcv:
+            self.peak_date = ohlcv[-1][self.btc_ticker]["date"]
         
         if len(ohlcv) < 200:
             log("Not enough data for analysis")
             return TargetAllocation(allocation)
         
-        btc_prices = [entry[self.btc_ticker]["close"] for entry in ohlcv]
-        btc_50_ma = VWAP(self.btc_ticker, ohlcv, 50)[-1]
-        btc_200_ma = VWAP(self.btc_ticker, ohlcv, 200)[-1]
+        btc_price = ohlcv[-1][self.btc_ticker]["close"]
+        signals = data.get("signals")
+        if signals:
+            btc_50_ma = signals["btc_vwap_50"]
+            btc_200_ma = signals["btc_vwap_200"]
+        else:
+            btc_50_ma = VWAP(self.btc_ticker, ohlcv, 50)[-1]
+            btc_200_ma = VWAP(self.btc_ticker, ohlcv, 200)[-1]
         
-        is_btc_bull = btc_prices[-1] > btc_200_ma
-        is_btc_bear = btc_prices[-1] < btc_50_ma
+        is_btc_bull = btc_price > btc_200_ma
+        is_btc_bear = btc_price < btc_50_ma
         
         
         
@@ -55,12 +84,12 @@ class TradingStrategy(Strategy):
         
         for ticker in self.tickers:
             ticker_prices = [entry[ticker]["close"] for entry in ohlcv]
-            peak_price = max(ticker_prices)
+            peak_price = self.peak_price[ticker]
             drawdown = (peak_price - ticker_prices[-1]) / peak_price
             monthly_return = (ticker_prices[-1] / ticker_prices[-21]) - 1 if len(ticker_prices) > 21 else 0
             
             #if drawdown > 0.25:
-            if drawdown > 0.05 and self.weights[ticker] > 0:
+            if drawdown > self.drawdown_stop and self.weights[ticker] > 0:
                 #log(f"Stop-loss triggered for {ticker}, reducing exposure")
                 self.weights[ticker] = 0.0
                 #log(f"Drawdown {self.weights[ticker]}")
@@ -1,12 +1,21 @@
 from surmount.base_class import Strategy, TargetAllocation
 from surmount.data import TopGovernmentContracts, TopLobbyingContracts, TopCongressTraders
-from surmount.logging import log
+from surmount.logging import log as surmount_log
+
+
+def log(message, *args, level="INFO"):
+    # The deployed log takes one preformatted string; a backtest LogSink replaces this
+    # function, and then only messages that pass its level and rate limits are formatted
+    surmount_log(message % args if args else message)
+
 
 class TradingStrategy(Strategy):
 
     def __init__(self):
         self.data_list = [TopGovernmentContracts(), TopLobbyingContracts()]
         self.contract_cache = {}  # For tracking contract award dates and price
+        self.cache_max_age = 252  # Bars a ticker can drop out of the universe before its award is forgotten
+        self.bar_count = 0
         self.tickers = []
 
     @property
@@ -26,6 +35,7 @@ class TradingStrategy(Strategy):
         gov_contracts = data[("top_government_contracts",)]
         lobbying_data = data[("top_lobbying_contracts",)]
         ohlcv_data = data["ohlcv"]
+        self.bar_count += 1
 
         lobbying_spend = {}
         contract_awards = set()
@@ -48,11 +58,21 @@ class TradingStrategy(Strategy):
             if ticker not in self.contract_cache:
                 self.contract_cache[ticker] = {
                     "award_price": price,
-                    "award_date": ohlcv_data[-1][ticker]["date"]
+                    "award_date": ohlcv_data[-1][ticker]["date"],
+                    "last_seen": self.bar_count
                 }
 
         self.tickers = list(set(lobbying_spend.keys()).union(contract_awards))
 
+        # Evict award entries for tickers that have been out of the universe for too long
+        for ticker in self.tickers:
+            if ticker in self.contract_cache:
+                self.contract_cache[ticker]["last_seen"] = self.bar_count
+        stale = [ticker for ticker, entry in self.contract_cache.items()
+                 if self.bar_count - entry["last_seen"] > self.cache_max_age]
+        for ticker in stale:
+            del self.contract_cache[ticker]
+
         # Calculate scores and apply lobbying weighting
         raw_scores = {}
         total_score = 0
@@ -74,7 +94,7 @@ class TradingStrategy(Strategy):
                 current_price = ohlcv_data[-1][ticker]["close"]
                 price_change = (current_price - award_price) / award_price
                 if price_change >= 0.5:
-                    log(f"Profit-taking on {ticker}: +{price_change*100:.1f}%")
+                    log("Profit-taking on %s: +%.1f%%", ticker, price_change * 100)
                     continue  # Skip allocating further to take profits
 
             raw_scores[ticker] = score
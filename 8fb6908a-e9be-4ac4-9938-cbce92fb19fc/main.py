@@ -12,6 +12,8 @@ class TradingStrategy(Strategy):
         self.current_allocation = {asset: 0 for asset in self.assets_list}
         self.data_list = []
         self.count = 0  # Initialize counter for 5-day rebalancing
+        self.short_lookback = 15  # Calendar days
+        self.long_lookback = 82  # Trading days
 
     @property
     def assets(self):
@@ -25,6 +27,14 @@ class TradingStrategy(Strategy):
     def data(self):
         return self.data_list
 
+    @property
+    def signals(self):
+        # SPY/BIL regime spreads a backtest driver may precompute and pass as data["signals"]
+        return {
+            "spy_spread": ("RETURN_SPREAD", "SPY", self.long_lookback, self.short_lookback),
+            "bil_spread": ("RETURN_SPREAD", "BIL", self.long_lookback, self.short_lookback),
+        }
+
     def run(self, data):
         ohlcv = data["ohlcv"]
         
@@ -42,14 +52,13 @@ class TradingStrategy(Strategy):
         # Calculate past date (52 weeks ago)
         today_str = ohlcv[-1]["SPY"]["date"]
         today = datetime.strptime(today_str, "%Y-%m-%d %H:%M:%S")  # Updated format to handle timestamp
-        past_date = today - timedelta(days=15)
-        lpast_date = today - timedelta(days=82)
+        past_date = today - timedelta(days=self.short_lookback)
 
         # Find the index of the most recent trading day on or before past_date
+        # Timestamps in this format sort as strings, so compare without parsing each row
+        past_str = past_date.strftime("%Y-%m-%d %H:%M:%S")
         for i in range(len(ohlcv)-1, -1, -1):
-            date_str = ohlcv[i]["SPY"]["date"]
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")  # Updated format
-            if date_obj <= past_date:
+            if ohlcv[i]["SPY"]["date"] <= past_str:
                 past_index = i
                 break
         else:
@@ -57,24 +66,31 @@ class TradingStrategy(Strategy):
         
 
         # Calculate SPY and BIL returns
-        try:
-            spy_close_today = ohlcv[-1]["SPY"]["close"]
-            spy_close_past = ohlcv[past_index]["SPY"]["close"]
-            spy_close_lpast = ohlcv[-82]["SPY"]["close"]
-            spy_ret = (spy_close_today / spy_close_past) - 1
-            spy_lret = (spy_close_today / spy_close_lpast) - 1
-            spy_ret = spy_lret - spy_ret
+        signals = data.get("signals")
+        if signals and len(ohlcv) >= self.long_lookback:
+            spy_ret = signals["spy_spread"]
+            bil_ret = signals["bil_spread"]
+            if spy_ret != spy_ret or bil_ret != bil_ret:
+                return TargetAllocation(self.current_allocation)  # NaN: missing data
+        else:
+            try:
+                spy_close_today = ohlcv[-1]["SPY"]["close"]
+                spy_close_past = ohlcv[past_index]["SPY"]["close"]
+                spy_close_lpast = ohlcv[-self.long_lookback]["SPY"]["close"]
+                spy_ret = (spy_close_today / spy_close_past) - 1
+                spy_lret = (spy_close_today / spy_close_lpast) - 1
+                spy_ret = spy_lret - spy_ret
 
 
-            bil_close_today = ohlcv[-1]["BIL"]["close"]
-            bil_close_past = ohlcv[past_index]["BIL"]["close"]
-            bil_close_lpast = ohlcv[-82]["BIL"]["close"]
-            bil_ret = (bil_close_today / bil_close_past) - 1
-            bil_lret = (bil_close_today / bil_close_lpast) - 1
-            bil_ret = bil_lret - bil_ret
+                bil_close_today = ohlcv[-1]["BIL"]["close"]
+                bil_close_past = ohlcv[past_index]["BIL"]["close"]
+                bil_close_lpast = ohlcv[-self.long_lookback]["BIL"]["close"]
+                bil_ret = (bil_close_today / bil_close_past) - 1
+                bil_lret = (bil_close_today / bil_close_lpast) - 1
+                bil_ret = bil_lret - bil_ret
 
-        except KeyError:
-            return TargetAllocation(self.current_allocation)  # Handle missing data
+            except KeyError:
+                return TargetAllocation(self.current_allocation)  # Handle missing data
 
         if spy_ret > bil_ret:
             # Bullish market: Allocate to top-performing sector ETFs
@@ -84,7 +100,7 @@ class TradingStrategy(Strategy):
                 try:
                     close_today = ohlcv[-1][sector]["close"]
                     close_past = ohlcv[past_index][sector]["close"]
-                    close_lpast = ohlcv[-82][sector]["close"]
+                    close_lpast = ohlcv[-self.long_lookback][sector]["close"]
                     ret = (close_today / close_past) - 1
                     lret = (close_today / close_lpast) - 1
                     ret = lret - ret
@@ -1,7 +1,14 @@
 from surmount.base_class import Strategy, TargetAllocation
 from surmount.technical_indicators import SMA
 from surmount.data import FiveYearBreakevenInflationRate
-from surmount.logging import log
+from surmount.logging import log as surmount_log
+
+
+def log(message, *args, level="INFO"):
+    # The deployed log takes one preformatted string; a backtest LogSink replaces this
+    # function, and then only messages that pass its level and rate limits are formatted
+    surmount_log(message % args if args else message)
+
 
 class TradingStrategy(Strategy):
     """
@@ -51,22 +58,22 @@ class TradingStrategy(Strategy):
         if inflation_data and current_cpi > 2:
             allocations["GLD"] += 0.20  # Increase gold allocation
             allocations["XOM"] += 0.20  # Increase oil allocation
-            log("High inflation expectations detected (5-year forward > 5%), increasing allocation to GLD and XOM")
-            log(f"CURRENT CPI :  {current_cpi}")
+            log("High inflation expectations detected (5-year forward > 5%), increasing allocation to GLD and XOM", level="DEBUG")
+            log("CURRENT CPI :  %s", current_cpi, level="DEBUG")
 
         # Profit-Taking Rule: If GLD rises >15% in a quarter, rebalance
         gld_prices = [ohlcv[i]["GLD"]["close"] for i in range(-63, 0)]  # Approx. 63 trading days in a quarter
         if gld_prices[0] and gld_prices[-1] and ((gld_prices[-1] - gld_prices[0]) / gld_prices[0]) > 0.15:
             allocations["GLD"] -= 0.10  # Reduce allocation to GLD
             log("GLD up more than 15% this quarter, reducing allocation")
-            log(f"CURRENT CPI :  {current_cpi}")
+            log("CURRENT CPI :  %s", current_cpi)
 
         # Stop-Loss Rule: If oil stocks drop >10% in a month, trim allocation
         for ticker in ["XOM", "COP"]:
             stock_prices = [ohlcv[i][ticker]["close"] for i in range(-21, 0)]  # Approx. 21 trading days in a month
             if stock_prices[0] and stock_prices[-1] and ((stock_prices[-1] - stock_prices[0]) / stock_prices[0]) < -0.10:
                 allocations[ticker] -= 0.05  # Reduce exposure to oil stocks
-                log(f"{ticker} dropped more than 10% this month, trimming allocation")
+                log("%s dropped more than 10%% this month, trimming allocation", ticker)
 
         # Normalize allocations to ensure they sum to 1
         total_allocation = sum(allocations.values())
@@ -0,0 +1,7 @@
+"""
+Local research tooling shared by the strategy modules in this repository.
+
+Each strategy directory still ships a single self-contained ``main.py``; the
+code in this package only drives those modules offline (backtests, sweeps,
+benchmarks) and never needs to be uploaded alongside them.
+"""
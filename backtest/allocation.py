@@ -0,0 +1,261 @@
+"""
+Sparse allocation changes between consecutive bars.
+
+Strategies such as f54b1352 return the same weights for dozens of bars, so
+routing the full ``TargetAllocation`` each bar mostly re-sends what is
+already held. ``AllocationDiffer`` compares every new allocation with the
+weights it last emitted and returns only the tickers that moved by more than
+``tolerance``; a bar where nothing did is a no-op that order generation and
+persistence can skip:
+
+    differ = AllocationDiffer(tolerance=0.005)
+    for date, allocation in allocations:
+        delta = differ.diff(allocation, date)
+        if not delta.noop:
+            route(delta.changes)
+
+Drift below the tolerance is not lost: the reference weight only moves when
+a change is emitted, so small steps accumulate until they cross it. Exits
+are never suppressed: a held ticker that is set to 0 or left out is always
+emitted as 0.0, however small the position, so no residual is left behind.
+
+For storage, ``TickerIndex`` assigns every ticker a column once for the
+whole portfolio, ``Weights`` is a slotted array-backed allocation over that
+index (NaN = not in the allocation, so explicit zeros survive), and
+``AllocationMatrix`` keeps an allocation history as one dense float32
+(bars x tickers) array instead of a list of dicts.
+"""
+import numpy as np
+import pandas as pd
+
+
+def weights_of(allocation):
+    """Plain {ticker: weight} dict from a ``TargetAllocation`` (or a dict)."""
+    if allocation is None:
+        return {}
+    weights = getattr(allocation, "target_allocation", allocation)
+    return dict(weights)
+
+
+class TickerIndex:
+    """Ticker -> column mapping shared by every allocation in a run; only ever grows."""
+
+    def __init__(self, tickers=()):
+        self.tickers = []
+        self.columns = {}
+        for ticker in tickers:
+            self.add(ticker)
+
+    def add(self, ticker):
+        """Column of ``ticker``, assigning the next free one on first sight."""
+        column = self.columns.get(ticker)
+        if column is None:
+            column = self.columns[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        return column
+
+    def __getitem__(self, ticker):
+        return self.columns[ticker]
+
+    def __contains__(self, ticker):
+        return ticker in self.columns
+
+    def __len__(self):
+        return len(self.tickers)
+
+
+class Weights:
+    """One allocation as an array over a ``TickerIndex``; usable wherever a ``TargetAllocation`` is read."""
+
+    __slots__ = ("index", "values")
+
+    def __init__(self, index, values=None, dtype=np.float64):
+        self.index = index
+        self.values = np.full(len(index), np.nan, dtype=dtype) if values is None else values
+
+    @classmethod
+    def from_dict(cls, index, weights, dtype=np.float64):
+        columns = [index.add(ticker) for ticker in weights]
+        allocation = cls(index, dtype=dtype)
+        allocation.values[columns] = list(weights.values())
+        return allocation
+
+    def __getitem__(self, ticker):
+        column = self.index.columns.get(ticker)
+        if column is None or column >= len(self.values) or np.isnan(self.values[column]):
+            return 0.0
+        return float(self.values[column])
+
+    def __setitem__(self, ticker, weight):
+        column = self.index.add(ticker)
+        if column >= len(self.values):
+            grown = np.full(len(self.index), np.nan, dtype=self.values.dtype)
+            grown[:len(self.values)] = self.values
+            self.values = grown
+        self.values[column] = weight
+
+    def items(self):
+        for column in np.flatnonzero(~np.isnan(self.values)):
+            yield self.index.tickers[column], float(self.values[column])
+
+    def to_dict(self):
+        return dict(self.items())
+
+    @property
+    def target_allocation(self):
+        return self.to_dict()
+
+    def normalize(self, total=1.0):
+        """Scale positive weights to sum to ``total``; returns a new ``Weights``."""
+        values = np.where(self.values > 0, self.values, np.where(np.isnan(self.values), np.nan, 0.0))
+        held = np.nansum(values)
+        return Weights(self.index, values * (total / held) if held > 0 else values)
+
+    def clip(self, low=0.0, high=1.0):
+        """Bound every weight to [low, high]; returns a new ``Weights``."""
+        return Weights(self.index, np.clip(self.values, low, high))
+
+
+def normalize(weights, total=1.0):
+    """Dict version of ``Weights.normalize``: negatives become 0 and the rest sum to ``total``."""
+    weights = {ticker: max(float(weight), 0.0) for ticker, weight in weights.items()}
+    held = sum(weights.values())
+    if held <= 0:
+        return weights
+    return {ticker: weight * total / held for ticker, weight in weights.items()}
+
+
+def clip(weights, low=0.0, high=1.0):
+    """Dict version of ``Weights.clip``: ``min(max(weight, low), high)`` for every ticker."""
+    return {ticker: min(max(float(weight), low), high) for ticker, weight in weights.items()}
+
+
+class AllocationMatrix:
+    """Allocation history as a dense (bars x tickers) array over a shared ``TickerIndex``; NaN = not held."""
+
+    def __init__(self, index, capacity=256, dtype=np.float32):
+        self.index = index
+        self.length = 0
+        self._values = np.full((capacity, max(len(index), 1)), np.nan, dtype=dtype)
+        self._used = np.zeros(self._values.shape[1], dtype=bool)
+
+    def _reserve(self, rows, columns):
+        have_rows, have_columns = self._values.shape
+        if rows <= have_rows and columns <= have_columns:
+            return
+        shape = (max(rows, 2 * have_rows) if rows > have_rows else have_rows,
+                 max(columns, 2 * have_columns) if columns > have_columns else have_columns)
+        grown = np.full(shape, np.nan, dtype=self._values.dtype)
+        grown[:have_rows, :have_columns] = self._values
+        self._values = grown
+        used = np.zeros(shape[1], dtype=bool)
+        used[:have_columns] = self._used
+        self._used = used
+
+    def append(self, allocation):
+        """Append one bar's allocation (``Weights``, ``TargetAllocation`` or dict)."""
+        if isinstance(allocation, Weights):
+            values = allocation.values
+            columns = np.flatnonzero(~np.isnan(values))
+            values = values[columns]
+        else:
+            weights = weights_of(allocation)
+            columns = np.fromiter((self.index.add(ticker) for ticker in weights), dtype=np.intp, count=len(weights))
+            values = np.fromiter(weights.values(), dtype=float, count=len(weights))
+        self._reserve(self.length + 1, len(self.index))
+        self._values[self.length, columns] = values
+        self._used[columns] = True
+        self.length += 1
+
+    @property
+    def values(self):
+        """Read-only (bars x len(index)) view of the history so far."""
+        view = self._values[:self.length, :len(self.index)]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def tickers(self):
+        """Tickers that appeared in at least one appended allocation."""
+        return [ticker for column, ticker in enumerate(self.index.tickers) if self._used[column]]
+
+    def row(self, bar):
+        return Weights(self.index, self.values[bar].copy())
+
+    def to_frame(self, dates=None):
+        """(bars x tickers) DataFrame of the tickers that were ever allocated."""
+        columns = np.flatnonzero(self._used[:len(self.index)])
+        return pd.DataFrame(
+            self.values[:, columns],
+            index=dates,
+            columns=[self.index.tickers[column] for column in columns],
+        )
+
+
+class AllocationDelta:
+    """Tickers whose target weight changed on one bar, as {ticker: new weight} (0.0 for exits)."""
+
+    __slots__ = ("date", "changes")
+
+    def __init__(self, date, changes):
+        self.date = date
+        self.changes = changes
+
+    @property
+    def noop(self):
+        return not self.changes
+
+    def __repr__(self):
+        return f"AllocationDelta({self.date!r}, {self.changes!r})"
+
+
+class AllocationDiffer:
+    """Turns a stream of allocations into ``AllocationDelta``s against the currently held weights."""
+
+    def __init__(self, tolerance=0.0):
+        self.tolerance = tolerance
+        self.held = {}
+        self.noops = 0
+        self.bars = 0
+
+    def diff(self, allocation, date=None):
+        weights = weights_of(allocation)
+        changes = {}
+        for ticker, weight in weights.items():
+            weight = float(weight or 0.0)
+            held = self.held.get(ticker, 0.0)
+            # Moves to 0 bypass the tolerance so a sub-tolerance position can still be closed
+            if abs(weight - held) > self.tolerance or (not weight and held):
+                changes[ticker] = weight
+        for ticker, held in self.held.items():
+            # Tickers left out of the new allocation are exits
+            if ticker not in weights and held:
+                changes[ticker] = 0.0
+        for ticker, weight in changes.items():
+            if weight:
+                self.held[ticker] = weight
+            else:
+                self.held.pop(ticker, None)
+        self.bars += 1
+        if not changes:
+            self.noops += 1
+        return AllocationDelta(date, changes)
+
+    def reset(self, held=None):
+        self.held = weights_of(held)
+
+
+def frame_deltas(frame, tolerance=0.0):
+    """
+    ``{strategy: [AllocationDelta per bar]}`` for a ``Harness.run`` frame.
+    Missing weights (NaN) count as 0.
+    """
+    deltas = {}
+    for strategy in frame.columns.get_level_values("strategy").unique():
+        weights = frame[strategy].fillna(0.0)
+        differ = AllocationDiffer(tolerance)
+        tickers = list(weights.columns)
+        deltas[strategy] = [
+            differ.diff(dict(zip(tickers, row)), date) for date, row in zip(weights.index, weights.to_numpy())
+        ]
+    return deltas
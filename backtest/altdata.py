@@ -0,0 +1,207 @@
+"""
+Alternative data (``Ratios``, macro series, contract feeds) aligned to bars.
+
+``AltDataCache`` stores each series column-wise, optionally on disk as one
+``.npz`` per data key, so repeated backtests neither re-fetch nor re-parse
+fundamentals. ``align`` maps every bar to the last record at or before it
+(an as-of join done once with a binary search), after which both the
+strategy-facing record views and ``latest`` lookups are O(1) per bar:
+
+    cache = AltDataCache("~/.cache/surmount-alt")
+    harness.load(loader, alt_loader=cache.loader(fetch_from_vendor))
+
+    cache.align(history.times)
+    cache.latest("ratios", "TSLA", "priceToBook", bar)
+"""
+import os
+from collections.abc import Sequence
+from urllib.parse import quote
+
+import numpy as np
+
+from backtest.dates import parse_dates
+
+TIME = "__time__"
+# Publication time of records without a "date": before any bar, so they are visible from the start
+UNDATED = np.datetime64(np.iinfo(np.int64).min + 1, "s")
+
+
+class AsOfRecords(Sequence):
+    """The first ``stop`` records of a series, i.e. everything published as of a bar, without copying."""
+
+    def __init__(self, records, stop):
+        self._records = records
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._records[i] for i in range(*index.indices(self._stop))]
+        if index < 0:
+            index += self._stop
+        if not 0 <= index < self._stop:
+            raise IndexError("AsOfRecords index out of range")
+        return self._records[index]
+
+    def __iter__(self):
+        for i in range(self._stop):
+            yield self._records[i]
+
+
+def to_columns(records):
+    """
+    Turn a list of record dicts into sorted columns: numeric fields become
+    float64 (NaN where missing), everything else unicode strings. Records
+    without a "date" sort first and count as published before any bar.
+    """
+    times = parse_dates([str(record["date"]) if record.get("date") is not None else None for record in records])
+    times[np.isnat(times)] = UNDATED
+    order = np.argsort(times, kind="stable")
+    fields = list(dict.fromkeys(field for record in records for field in record))
+    columns = {TIME: times[order]}
+    for field in fields:
+        values = [records[i].get(field) for i in order]
+        if all(value is None or isinstance(value, (int, float)) for value in values):
+            columns[field] = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        else:
+            columns[field] = np.array(["" if value is None else str(value) for value in values])
+    return columns
+
+
+def to_records(columns):
+    """Inverse of ``to_columns``; missing values (NaN / "") are left out of each record."""
+    fields = [field for field in columns if field != TIME]
+    records = []
+    for i in range(len(columns[TIME])):
+        record = {}
+        for field in fields:
+            value = columns[field][i]
+            if columns[field].dtype.kind == "f":
+                if not np.isnan(value):
+                    record[field] = float(value)
+            elif value != "":
+                record[field] = str(value)
+        records.append(record)
+    return records
+
+
+class AltDataCache:
+    """Columnar alternative data keyed like ``data`` (e.g. ("ratios", "TSLA")), optionally persisted under ``root``."""
+
+    def __init__(self, root=None):
+        self.root = os.path.expanduser(root) if root else None
+        if self.root:
+            os.makedirs(self.root, exist_ok=True)
+        self._columns = {}
+        self._records = {}
+        self._aligned = {}
+        self._times = None
+
+    def _path(self, key):
+        return os.path.join(self.root, "-".join(quote(str(part), safe="") for part in key) + ".npz")
+
+    def put(self, key, records):
+        """Store a series (and write it to disk when the cache has a root)."""
+        columns = to_columns(records)
+        self._columns[key] = columns
+        # Keep records in the same time order as the columns
+        self._records[key] = to_records(columns)
+        self._aligned.pop(key, None)
+        if self.root:
+            np.savez(self._path(key), **columns)
+
+    def put_columns(self, key, columns):
+        """Store a series that is already in ``to_columns`` form (sorted by ``TIME``); records are built on demand."""
+        self._columns[key] = columns
+        self._records.pop(key, None)
+        self._aligned.pop(key, None)
+        if self.root:
+            np.savez(self._path(key), **columns)
+
+    def get(self, key):
+        """Columns for ``key`` from memory or disk, or None if it was never stored."""
+        if key not in self._columns and self.root and os.path.exists(self._path(key)):
+            with np.load(self._path(key)) as stored:
+                self._columns[key] = {field: stored[field] for field in stored.files}
+        return self._columns.get(key)
+
+    def records(self, key):
+        if key not in self._records:
+            columns = self.get(key)
+            self._records[key] = to_records(columns) if columns is not None else []
+        return self._records[key]
+
+    def loader(self, fetch):
+        """
+        Wrap ``fetch(keys) -> {key: records}`` so only keys missing from the
+        cache are fetched. The wrapped loader returns the cache itself, which
+        ``Harness.load(alt_loader=...)`` uses directly without re-parsing.
+        """
+        def load(keys):
+            missing = [key for key in keys if self.get(key) is None]
+            if missing:
+                for key, records in fetch(missing).items():
+                    self.put(key, records)
+            return self
+        return load
+
+    def align(self, times):
+        """
+        As-of join every cached series onto bar timestamps ``times``. Series
+        still on disk only (a cache reopened on an existing ``root``) are
+        joined when first asked for.
+        """
+        self._times = np.asarray(times)
+        self._aligned = {}
+        for key in list(self._columns):
+            self._align(key)
+
+    def _align(self, key):
+        """Bar -> row count array of ``key``, joining it now if it was loaded after ``align``; None if unknown."""
+        if key not in self._aligned:
+            columns = self.get(key)
+            if columns is None or self._times is None:
+                return None
+            self._aligned[key] = np.searchsorted(columns[TIME], self._times, side="right")
+        return self._aligned[key]
+
+    def as_of(self, key, bar):
+        """Records of ``key`` published at or before bar ``bar``."""
+        return AsOfRecords(self.records(key), self.rows_as_of(key, bar))
+
+    def at(self, key, time):
+        """Records of ``key`` published at or before ``time``, for feeds whose bars aren't known up front."""
+        columns = self.get(key)
+        if columns is None:
+            return AsOfRecords([], 0)
+        stop = int(np.searchsorted(columns[TIME], np.datetime64(time, "s"), side="right"))
+        return AsOfRecords(self.records(key), stop)
+
+    def rows_as_of(self, key, bar):
+        """Number of records of ``key`` published at or before bar ``bar``."""
+        aligned = self._align(key)
+        return int(aligned[bar]) if aligned is not None else 0
+
+    def tickers(self, key, start=0, stop=None):
+        """Distinct ``ticker`` values of records ``[start, stop)`` of ``key``, in first-seen order."""
+        columns = self.get(key)
+        if columns is None or "ticker" not in columns:
+            return []
+        values = columns["ticker"][start:stop]
+        return [ticker for ticker in dict.fromkeys(values.tolist()) if ticker]
+
+    def latest(self, source, ticker=None, field="value", bar=-1):
+        """Most recent ``field`` of ``(source, ticker)`` (or ``(source,)``) as of ``bar``; None if absent."""
+        key = (source, ticker) if ticker is not None else (source,)
+        aligned = self._align(key)
+        if aligned is None:
+            return None
+        row = int(aligned[bar]) - 1
+        if row < 0:
+            return None
+        value = self._columns[key][field][row]
+        if self._columns[key][field].dtype.kind == "f":
+            return None if np.isnan(value) else float(value)
+        return str(value) or None
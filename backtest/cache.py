@@ -0,0 +1,145 @@
+"""
+Bar-scoped memoization for ``surmount.technical_indicators`` calls.
+
+Strategies frequently evaluate the same indicator twice in one ``run``
+(``RSI(ticker, ohlcv, 14)[-1] if RSI(ticker, ohlcv, 14) else 50``). Wrapping
+the functions with a ``BarCache`` makes the second call a dictionary lookup.
+Results are keyed on (indicator, ticker, length, window) and everything is
+dropped as soon as a call arrives for a newer bar. Bars are told apart by
+their dates rather than by identity, since views such as ``OhlcvView`` build
+a new bar object on every access.
+
+``IndicatorRegistry`` is one such cache shared by every strategy in a
+portfolio: NVDA's RSI(14) requested by four strategies on the same window is
+computed once per bar and the same result list handed to all of them, so it
+must be treated as read-only.
+"""
+import functools
+import sys
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from backtest.dates import bar_date
+
+INDICATOR_NAMES = ("SMA", "STDEV", "RSI", "VWAP")
+
+
+class BarCache:
+    """Memo of indicator results for the most recent bar, with hit/miss counters."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._bar = None
+        self._results = {}
+
+    def _advance(self, data):
+        # The newest bar's date identifies the bar
+        bar = bar_date(data[-1]) if len(data) else None
+        if bar != self._bar:
+            self._bar = bar
+            self._results.clear()
+
+    def call(self, func, ticker, data, length, *args, **kwargs):
+        self._advance(data)
+        # The first bar's date and len(data) pin down the window: they separate calls
+        # on trailing slices such as ohlcv[-63:] and views with different lookbacks
+        first = bar_date(data[0]) if len(data) else None
+        key = (func.__name__, ticker, length, first, len(data)) + args + tuple(sorted(kwargs.items()))
+        try:
+            result = self._results[key]
+        except KeyError:
+            self.misses += 1
+            result = self._results[key] = func(ticker, data, length, *args, **kwargs)
+        else:
+            self.hits += 1
+        return result
+
+    def wrap(self, func):
+        """Return ``func`` with the same call signature, memoized through this cache."""
+        @functools.wraps(func)
+        def cached(ticker, data, length, *args, **kwargs):
+            return self.call(func, ticker, data, length, *args, **kwargs)
+        cached._uncached = func
+        return cached
+
+    def patch(self, module, names=INDICATOR_NAMES):
+        """Swap the indicator functions a strategy module imported for cached ones."""
+        for name in names:
+            func = getattr(module, name, None)
+            if func is not None:
+                setattr(module, name, self.wrap(getattr(func, "_uncached", func)))
+
+    def clear(self):
+        self._bar = None
+        self._results.clear()
+
+    def stats(self):
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / calls if calls else 0.0,
+        }
+
+
+class IndicatorRegistry(BarCache):
+    """``BarCache`` shared across strategies, recording which strategies request each (indicator, ticker, length)."""
+
+    def __init__(self):
+        super().__init__()
+        # (indicator, ticker, length) -> names of the strategies that asked for it
+        self.requests = defaultdict(set)
+        self._local = threading.local()
+
+    def _wrap_run(self, name, run):
+        @functools.wraps(run)
+        def attributed_run(data):
+            self._local.strategy = name
+            try:
+                return run(data)
+            finally:
+                self._local.strategy = None
+        return attributed_run
+
+    def call(self, func, ticker, data, length, *args, **kwargs):
+        self.requests[(func.__name__, ticker, length)].add(getattr(self._local, "strategy", None))
+        return super().call(func, ticker, data, length, *args, **kwargs)
+
+    @contextmanager
+    def attach(self, strategies):
+        """Route every indicator call of ``{name: strategy}`` through this registry inside the ``with`` block."""
+        own_runs = {}
+        originals = {}
+        try:
+            for name, strategy in strategies.items():
+                own_runs[name] = strategy.__dict__.get("run")
+                strategy.run = self._wrap_run(name, strategy.run)
+                module = sys.modules.get(type(strategy).__module__)
+                if module is None or module in originals:
+                    continue
+                originals[module] = {
+                    indicator: getattr(module, indicator) for indicator in INDICATOR_NAMES if hasattr(module, indicator)
+                }
+                self.patch(module)
+            yield self
+        finally:
+            for name, run in own_runs.items():
+                if run is None:
+                    del strategies[name].run
+                else:
+                    strategies[name].run = run
+            for module, funcs in originals.items():
+                for indicator, func in funcs.items():
+                    setattr(module, indicator, func)
+            self.clear()
+
+    def shared(self):
+        """{(indicator, ticker, length): strategies} for every request made by more than one strategy."""
+        return {key: sorted(names) for key, names in self.requests.items() if len(names) > 1}
+
+    def stats(self):
+        stats = super().stats()
+        stats["shared"] = len(self.shared())
+        return stats
@@ -0,0 +1,83 @@
+"""
+Cross-sectional scoring over a (tickers x bars) close matrix.
+
+These replace the ticker-by-ticker dict loops in the strategies with one
+NumPy call across the whole universe, e.g. for the latest bar:
+
+    closes = select(data["history"], self.tickers)
+    stats = snapshot(closes, lookbacks=(21, 63, 126), vol_window=20, peak_window=63)
+    weights = inverse_vol_weights(stats["vol"], mask=stats["return_63"] > 0)
+    allocation = to_dict(self.tickers, weights)
+
+Lookbacks follow the strategies' indexing idiom: a lookback of 63 compares
+``closes[-1]`` with ``closes[-63]``. Tickers without enough history get NaN
+scores and zero weight.
+"""
+import numpy as np
+
+PERIODS_PER_YEAR = 252
+
+
+def select(history, tickers, field="close"):
+    """(len(tickers) x bars) matrix of ``field`` for just ``tickers``, in that order."""
+    return history.matrix(field)[[history.index[ticker] for ticker in tickers]]
+
+
+def trailing_return(closes, lookback):
+    """``closes[:, -1] / closes[:, -lookback] - 1`` for every ticker; NaN if too short."""
+    closes = np.asarray(closes, dtype=float)
+    if closes.shape[1] < lookback:
+        return np.full(closes.shape[0], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return closes[:, -1] / closes[:, -lookback] - 1
+
+
+def realized_vol(closes, window=20, periods_per_year=PERIODS_PER_YEAR):
+    """Annualised std of log returns over the last ``window`` closes of every ticker."""
+    closes = np.asarray(closes, dtype=float)[:, -window:]
+    if closes.shape[1] < 2:
+        return np.full(closes.shape[0], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns = np.diff(np.log(closes), axis=1)
+    return np.nanstd(log_returns, axis=1) * np.sqrt(periods_per_year)
+
+
+def drawdown(closes, window=None):
+    """Fractional drop of the latest close from the peak of the last ``window`` closes (all if None)."""
+    closes = np.asarray(closes, dtype=float)
+    if not closes.shape[1]:
+        return np.full(closes.shape[0], np.nan)
+    recent = closes if window is None else closes[:, -window:]
+    with np.errstate(all="ignore"):
+        peak = np.nanmax(recent, axis=1)
+        return (peak - closes[:, -1]) / peak
+
+
+def inverse_vol_weights(vol, mask=None, floor=0.01):
+    """
+    Weights proportional to 1 / max(vol, floor) (only where ``mask``),
+    summing to 1. ``floor`` is in the units of ``vol``: with ``realized_vol``
+    (annualised std of log returns) this is 0f7e84e3's rule, whereas
+    f54b1352 floors ``STDEV`` of price levels at 0.01, so pass that measure
+    to reproduce it.
+    """
+    vol = np.asarray(vol, dtype=float)
+    with np.errstate(divide="ignore"):
+        inverse = np.where(np.isfinite(vol), 1 / np.maximum(vol, floor), 0.0)
+    if mask is not None:
+        inverse = np.where(mask, inverse, 0.0)
+    total = inverse.sum()
+    return inverse / total if total > 0 else np.zeros_like(inverse)
+
+
+def snapshot(closes, lookbacks=(21, 63, 126), vol_window=20, peak_window=None):
+    """Trailing returns, realized vol and drawdown for every ticker in one call."""
+    stats = {f"return_{lookback}": trailing_return(closes, lookback) for lookback in lookbacks}
+    stats["vol"] = realized_vol(closes, vol_window)
+    stats["drawdown"] = drawdown(closes, peak_window)
+    return stats
+
+
+def to_dict(tickers, values):
+    """Map a per-ticker array back to {ticker: float}, e.g. to build a ``TargetAllocation``."""
+    return {ticker: float(value) for ticker, value in zip(tickers, values)}
@@ -0,0 +1,60 @@
+"""
+Date helpers that work on parsed ``datetime64`` values instead of strings.
+
+Surmount bars carry their timestamp as a "%Y-%m-%d %H:%M:%S" string. These
+are parsed once when a bar enters a ``PriceHistory``; everything below then
+works on ``datetime64[s]`` arrays so no strptime runs on the hot path.
+"""
+import datetime
+
+import numpy as np
+
+
+def bar_date(bar):
+    """Timestamp string of a Surmount bar (taken from its first quote)."""
+    for quote in bar.values():
+        return quote.get("date")
+    return None
+
+
+def to_datetime64(value):
+    """Parse a Surmount date string, ``datetime``/``date`` or ``datetime64`` to ``datetime64[s]``."""
+    if value is None:
+        return np.datetime64("NaT", "s")
+    if isinstance(value, str):
+        return np.datetime64(value.replace(" ", "T"), "s")
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        value = datetime.datetime(value.year, value.month, value.day)
+    return np.datetime64(value, "s")
+
+
+def parse_dates(dates):
+    """Vectorised ``to_datetime64`` for a list of date strings."""
+    return np.array(
+        [date.replace(" ", "T") if date is not None else "NaT" for date in dates], dtype="datetime64[s]"
+    )
+
+
+def _next_business_day(times, holidays):
+    days = np.asarray(times).astype("datetime64[D]")
+    return days, np.busday_offset(days, 1, roll="forward", holidays=holidays)
+
+
+def is_month_end(times, holidays=None):
+    """True where the next business day falls in a later month."""
+    days, following = _next_business_day(times, holidays or [])
+    return days.astype("datetime64[M]") != following.astype("datetime64[M]")
+
+
+def is_quarter_end(times, holidays=None):
+    """True where the next business day falls in a later quarter."""
+    days, following = _next_business_day(times, holidays or [])
+    # Month numbers count from 1970-01, so integer division by 3 lines up with calendar quarters
+    return days.astype("datetime64[M]").astype(np.int64) // 3 != following.astype("datetime64[M]").astype(np.int64) // 3
+
+
+def is_week_end(times, holidays=None):
+    """True where the next business day falls in a later week (weeks start on Monday)."""
+    days, following = _next_business_day(times, holidays or [])
+    # 1970-01-01 was a Thursday; shift by 3 days so weeks roll over on Monday
+    return (days.astype(np.int64) + 3) // 7 != (following.astype(np.int64) + 3) // 7
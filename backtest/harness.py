@@ -0,0 +1,385 @@
+"""
+Portfolio harness that replays several strategy modules over one data load.
+
+The union of every strategy's ``assets`` is loaded once, the growing
+``data["ohlcv"]`` window and the columnar ``PriceHistory`` are extended once
+per bar, and each strategy's ``run`` is handed that shared window, the
+history as ``data["history"]`` and one shared streaming
+``backtest.indicators.IndicatorEngine`` as ``data["indicators"]``. The
+returned frame has one row per bar and (strategy, ticker) columns.
+
+``run`` is ``start`` + ``advance`` + ``frame``; driving those directly lets
+callers stop part-way, ``checkpoint`` the replay together with every
+strategy's own state, and ``restore`` it later (see ``backtest.walkforward``).
+"""
+import copy
+import importlib.util
+import os
+import sys
+from collections import defaultdict
+from contextlib import ExitStack
+
+import numpy as np
+import pandas as pd
+
+from backtest.allocation import AllocationMatrix, TickerIndex, weights_of
+from backtest.altdata import AltDataCache
+from backtest.dates import bar_date, parse_dates
+from backtest.history import OhlcvView, PriceHistory
+from backtest.indicators import IndicatorEngine
+from backtest.resample import Resampler
+from backtest.risk import RiskBook
+from backtest.schedule import parse_schedule
+from backtest.signals import SignalStore
+from backtest.universe import Universe
+from backtest.window import RingBuffer, WindowView
+
+
+def load_strategy(path, name=None):
+    """Import a strategy ``main.py`` by path and return its module."""
+    name = name or os.path.basename(os.path.dirname(os.path.abspath(path)))
+    module_name = "strategy_" + name.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so tools can find a strategy's module from type(strategy).__module__
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_strategies(root, names=None):
+    """Instantiate ``TradingStrategy`` from every ``<root>/<name>/main.py``, keyed by directory name."""
+    strategies = {}
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name, "main.py")
+        if not os.path.isfile(path) or (names is not None and name not in names):
+            continue
+        strategies[name] = load_strategy(path, name).TradingStrategy()
+    return strategies
+
+
+def data_keys(strategy):
+    """Keys under which a strategy's extra data sources appear in ``data``."""
+    return [tuple(source) for source in getattr(strategy, "data", None) or []]
+
+
+def as_feed(alt_data):
+    """An ``AltDataCache`` holding ``alt_data`` ({key: records} dict, cache or None)."""
+    if isinstance(alt_data, AltDataCache):
+        return alt_data
+    feed = AltDataCache()
+    for key, records in (alt_data or {}).items():
+        feed.put(key, records)
+    return feed
+
+
+class Harness:
+    """Run several ``TradingStrategy`` instances side by side over a single data load."""
+
+    def __init__(self, strategies, retire_after=21, signal_cache=None):
+        self.strategies = dict(strategies)
+        self.retire_after = retire_after
+        # Directory for precomputed ``signals`` series; None keeps them in memory only
+        self.signal_cache = signal_cache
+        intervals = {strategy.interval for strategy in self.strategies.values()}
+        if len(intervals) > 1:
+            raise ValueError(f"Strategies use different intervals: {sorted(intervals)}")
+        self.interval = intervals.pop() if intervals else "1day"
+        self.schedules = {
+            name: parse_schedule(getattr(strategy, "schedule", None)) for name, strategy in self.strategies.items()
+        }
+        self.lookbacks = {name: getattr(strategy, "lookback", None) for name, strategy in self.strategies.items()}
+        self.resample = {name: list(getattr(strategy, "resample", None) or []) for name, strategy in self.strategies.items()}
+        self.history = None
+        self.allocations = {}
+        self.universe = None
+        self._replay = None
+        self.errors = defaultdict(list)
+        self.calls = defaultdict(int)
+
+    @property
+    def assets(self):
+        """Union of every strategy's assets, in first-seen order."""
+        return list(dict.fromkeys(ticker for strategy in self.strategies.values() for ticker in strategy.assets))
+
+    def load(self, loader, alt_loader=None):
+        """
+        Fetch data once for the whole portfolio and replay it.
+
+        ``loader(tickers, interval)`` must return a Surmount-style ohlcv list and
+        ``alt_loader(keys)`` a {key: records} dict or an ``AltDataCache`` for the
+        extra data sources (``AltDataCache.loader`` builds one that caches
+        fetched series on disk).
+
+        Only the strategies' initial assets are fetched up front; any other
+        ticker (one a strategy adds to its assets, or one an alt data feed
+        names) is fetched when it joins the universe.
+        """
+        feed = None
+        if alt_loader is not None:
+            keys = list(dict.fromkeys(key for strategy in self.strategies.values() for key in data_keys(strategy)))
+            feed = as_feed(alt_loader(keys))
+        ohlcv = loader(self.assets, self.interval)
+        return self.run(ohlcv, feed, loader=loader)
+
+    def run(self, ohlcv, alt_data=None, profiler=None, indicators=None, results=None, loader=None):
+        """
+        Replay ``ohlcv``. ``alt_data`` is a {key: records} dict or an
+        ``AltDataCache``; pass a ``backtest.profiling.Profiler`` to time run and
+        indicator calls, a ``backtest.cache.IndicatorRegistry`` to compute
+        indicators requested by several strategies only once per bar, and a
+        ``backtest.results.ResultWriter`` to record every bar as it completes.
+        With ``loader`` (as for ``load``), tickers that join the universe but
+        are missing from ``ohlcv`` are fetched as they join.
+        """
+        with ExitStack() as stack:
+            if indicators is not None:
+                stack.enter_context(indicators.attach(self.strategies))
+            if profiler is not None:
+                stack.enter_context(profiler.attach(self.strategies))
+            return self._run(ohlcv, alt_data, results, loader)
+
+    def _run(self, ohlcv, alt_data, results=None, loader=None):
+        self.start(ohlcv, alt_data, results=results, loader=loader)
+        self.advance()
+        if results is not None:
+            results.flush()
+        return self.frame()
+
+    def start(self, ohlcv, alt_data=None, start=0, results=None, loader=None):
+        """
+        Set up a replay of ``ohlcv`` beginning at bar ``start`` (strategies see
+        nothing earlier) without running any bar yet; drive it with ``advance``.
+        """
+        feed = as_feed(alt_data)
+        # As-of join every series onto the bar timestamps once, up front
+        # An OhlcvView (e.g. over a memory-mapped store) is replayed straight off its
+        # arrays: the history is a cursor over them rather than a growing copy
+        mapped = isinstance(ohlcv, OhlcvView)
+        feed.align(ohlcv.history.times if mapped else parse_dates([bar_date(raw) for raw in ohlcv]))
+        # Strategies may change their assets while running (e.g. from alt data), so
+        # the active universe is re-read after every bar
+        self.universe = Universe(self.assets, max_age=self.retire_after)
+        if mapped:
+            # Starts at bar ``start``, so nothing earlier is visible through data["history"]
+            self.history = ohlcv.history.window(start).replay()
+            # Strategies read bars built on access from the cursor instead of stored
+            # dicts (every ticker in the store, not just the universe)
+            window = OhlcvView(self.history)
+        else:
+            self.history = PriceHistory(self.assets, capacity=len(ohlcv) - start)
+            if self.lookbacks and None not in self.lookbacks.values():
+                # Nobody needs more than the longest lookback, so don't keep older bars around
+                window = RingBuffer(max(self.lookbacks.values()))
+            else:
+                window = []
+        # One dense float32 allocation history per strategy over a shared ticker index
+        index = TickerIndex(self.assets)
+        self.allocations = {name: AllocationMatrix(index, capacity=len(ohlcv) - start) for name in self.strategies}
+        self.calls.clear()
+        declared = [getattr(strategy, "signals", None) or {} for strategy in self.strategies.values()]
+        signals = None
+        if any(declared):
+            # Regime series are computed over the replayed bars up front, in parallel
+            prices = ohlcv.history.window(start) if mapped else PriceHistory.from_ohlcv(ohlcv[start:])
+            signals = SignalStore(prices, self.signal_cache)
+            signals.precompute(spec for specs in declared for spec in specs.values())
+        # Stop and profit-take rules share trackers fed once per bar; rules declared
+        # later on (e.g. after a parameter change) get theirs seeded from the window
+        risk = None
+        if any(hasattr(strategy, "risk") for strategy in self.strategies.values()):
+            risk = RiskBook()
+            for strategy in self.strategies.values():
+                for spec in (getattr(strategy, "risk", None) or {}).values():
+                    risk.add(spec)
+        keys = {name: data_keys(strategy) for name, strategy in self.strategies.items()}
+        self._replay = {
+            "ohlcv": ohlcv,
+            "feed": feed,
+            "mapped": mapped,
+            "keys": keys,
+            # Tickers named by recently published alt data, {ticker: bar last named}, are
+            # candidates for the universe: a strategy can only pick them if their quotes
+            # reach the bar. Ordered from least to most recently named
+            "candidates": {},
+            "scanned": {key: 0 for key in dict.fromkeys(key for names in keys.values() for key in names)},
+            "loader": None if mapped else loader,
+            "loaded": set().union(*ohlcv) if loader is not None and not mapped else set(),
+            "start": start,
+            "col": start,
+            "window": window,
+            "views": {name: WindowView(window, size) if size else window for name, size in self.lookbacks.items()},
+            "resampler": Resampler(
+                dict.fromkeys(interval for intervals in self.resample.values() for interval in intervals)
+            ),
+            "signals": signals,
+            "risk": risk,
+            # Streaming indicators strategies register and catch up themselves; shared so
+            # one requested by several strategies is only fed once per bar
+            "indicators": IndicatorEngine(),
+            "results": results,
+            "dates": [],
+            "last": {name: None for name in self.strategies},
+        }
+
+    def advance(self, stop=None):
+        """Run bars up to (not including) ``stop``, or to the end of the data."""
+        replay = self._replay
+        ohlcv, feed, mapped, keys = replay["ohlcv"], replay["feed"], replay["mapped"], replay["keys"]
+        window, views, resampler = replay["window"], replay["views"], replay["resampler"]
+        dates, last, risk = replay["dates"], replay["last"], replay["risk"]
+        # The history only holds bars from the replay's start on
+        offset = replay["start"]
+        stop = len(ohlcv) if stop is None else min(stop, len(ohlcv))
+        # A mapped replay only builds bar dicts for consumers that need one
+        needs_bar = bool(resampler.aggregators) or risk is not None or replay["results"] is not None
+
+        for col in range(replay["col"], stop):
+            candidates = replay["candidates"]
+            for key, scanned in replay["scanned"].items():
+                published = feed.rows_as_of(key, col)
+                if published > scanned:
+                    for ticker in feed.tickers(key, scanned, published):
+                        candidates.pop(ticker, None)
+                        candidates[ticker] = col
+                    replay["scanned"][key] = published
+            # Tickers the feeds stopped naming expire on the universe's own schedule
+            while candidates:
+                ticker, named = next(iter(candidates.items()))
+                if col - named <= self.retire_after:
+                    break
+                del candidates[ticker]
+            added = self.universe.request(candidates)
+            if added:
+                self._fetch(added, col)
+                if not mapped:
+                    self.history.add_tickers(added)
+            if mapped:
+                self.history.length = col + 1 - offset
+                date = self.history.dates[col - offset]
+                raw = bar = ohlcv[col] if needs_bar else None
+            else:
+                raw = ohlcv[col]
+                date = bar_date(raw)
+                # Only tickers some strategy currently wants reach the window and history
+                bar = {ticker: raw[ticker] for ticker in self.universe if ticker in raw}
+                window.append(bar)
+                self.history.append(bar, date)
+                # Mapped dates are read off the history instead
+                dates.append(date)
+            if resampler.aggregators:
+                resampler.update(bar)
+            if risk is not None:
+                risk.update(bar)
+            resampled = resampler.views() if resampler.aggregators else {}
+            alt_now = {}
+            for name, strategy in self.strategies.items():
+                schedule = self.schedules[name]
+                if schedule is not None and last[name] is not None and not schedule.due(self.history, col - offset):
+                    # Off-schedule: carry the previous allocation without calling run
+                    self.allocations[name].append(last[name])
+                    continue
+                data = {"ohlcv": views[name], "history": self.history, "indicators": replay["indicators"]}
+                declared = getattr(strategy, "signals", None)
+                if declared:
+                    data["signals"] = replay["signals"].at(declared, col - replay["start"])
+                rules = getattr(strategy, "risk", None)
+                if rules:
+                    data["risk"] = risk.at(rules, window)
+                for interval in self.resample[name]:
+                    data[f"ohlcv_{interval}"] = resampled[f"ohlcv_{interval}"]
+                for key in keys[name]:
+                    if key not in alt_now:
+                        alt_now[key] = feed.as_of(key, col)
+                    data[key] = alt_now[key]
+                self.calls[name] += 1
+                try:
+                    last[name] = weights_of(strategy.run(data))
+                except Exception as e:
+                    # Keep the previous allocation, as a live deployment would
+                    self.errors[name].append((date, repr(e)))
+                    if last[name] is None:
+                        last[name] = {}
+                self.allocations[name].append(last[name])
+            if replay["results"] is not None:
+                # All quotes, not just the universe: a position can be opened before its ticker joins it
+                replay["results"].append(date, last, raw)
+            added, retired = self.universe.update(self.assets + list(candidates))
+            self._fetch(added, col + 1)
+            if not mapped:
+                self.history.add_tickers(added)
+                self.history.drop_tickers(retired)
+            replay["col"] = col + 1
+
+    def _fetch(self, tickers, col):
+        """Merge quotes for ``tickers`` not loaded yet into bars ``col`` onward, via the replay's loader."""
+        replay = self._replay
+        missing = [ticker for ticker in tickers if ticker not in replay["loaded"]]
+        if replay["loader"] is None or not missing:
+            return
+        replay["loaded"].update(missing)
+        fetched = {bar_date(bar): bar for bar in replay["loader"](missing, self.interval)}
+        for raw in replay["ohlcv"][col:]:
+            quotes = fetched.get(bar_date(raw))
+            if quotes:
+                raw.update((ticker, quotes[ticker]) for ticker in missing if ticker in quotes)
+
+    @property
+    def position(self):
+        """Index of the next bar ``advance`` will run."""
+        return self._replay["col"]
+
+    def frame(self, start=None):
+        """Allocations so far as a (bars x (strategy, ticker)) frame, optionally from bar ``start`` on."""
+        offset = 0 if start is None else start - self._replay["start"]
+        dates = self.history.dates[:len(self.history)] if self._replay["mapped"] else self._replay["dates"]
+        dates = pd.Index(list(dates[offset:]), name="date")
+        frames = {name: matrix.to_frame()[offset:] for name, matrix in self.allocations.items()}
+        frames = {name: frame for name, frame in frames.items() if len(frame.columns)}
+        if not frames:
+            return pd.DataFrame(index=dates, dtype=np.float32)
+        frame = pd.concat(frames, axis=1, names=["strategy", "ticker"])
+        frame.index = dates
+        return frame.sort_index(axis=1)
+
+    def checkpoint(self):
+        """
+        Snapshot of the replay so far, including each strategy's attributes
+        (running peaks, cached allocations, counters, ...), for ``restore``.
+        Bars, alt data and mapped price arrays are shared, not copied.
+        """
+        replay = self._replay
+        state = {
+            "replay": replay,
+            "history": self.history,
+            "universe": self.universe,
+            "allocations": self.allocations,
+            "strategies": {name: strategy.__dict__ for name, strategy in self.strategies.items()},
+        }
+        return copy.deepcopy(state, self._shared(state))
+
+    @staticmethod
+    def _shared(state):
+        """deepcopy memo that keeps the input data itself shared between checkpoints."""
+        replay = state["replay"]
+        shared = [replay["ohlcv"], replay["feed"], replay["signals"], replay["results"]]
+        if replay["mapped"]:
+            # The cursor's arrays are views of the mapped files; only its length is state
+            for history in (replay["ohlcv"].history, state["history"]):
+                shared.extend(history._columns.values())
+                shared.extend([history._times, history.dates])
+        else:
+            shared.extend(quote for bar in replay["window"] for quote in bar.values())
+        return {id(obj): obj for obj in shared}
+
+    def restore(self, checkpoint):
+        """Rewind (or fast-forward) to a ``checkpoint``; it stays reusable for further restores."""
+        state = copy.deepcopy(checkpoint, self._shared(checkpoint))
+        self._replay = state["replay"]
+        self.history = state["history"]
+        self.universe = state["universe"]
+        self.allocations = state["allocations"]
+        for name, attributes in state["strategies"].items():
+            strategy = self.strategies[name]
+            strategy.__dict__.clear()
+            strategy.__dict__.update(attributes)
@@ -0,0 +1,305 @@
+import copy
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+from backtest.dates import parse_dates, to_datetime64
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class FieldView:
+    """Ticker -> zero-copy view of one OHLCV field, e.g. ``history.closes["SPY"]``."""
+
+    def __init__(self, history, field):
+        self._history = history
+        self._field = field
+
+    def __getitem__(self, ticker):
+        return self._history.series(ticker, self._field)
+
+    def __contains__(self, ticker):
+        return ticker in self._history.index
+
+    def __iter__(self):
+        return iter(self._history.tickers)
+
+    def __len__(self):
+        return len(self._history.tickers)
+
+
+class PriceHistory:
+    """
+    Columnar OHLCV history that grows by one bar at a time.
+
+    Every field is stored as a (tickers x capacity) NumPy array and bars are
+    written into the next free column, so appending is O(tickers) and reading
+    a ticker's series is a slice rather than a rebuilt Python list. Capacity
+    doubles when it runs out, which keeps appends amortised O(1).
+
+    Views handed out by ``series``/``matrix``/``closes`` are read-only and only
+    valid until the next append that triggers a resize, so take them inside
+    ``run`` rather than caching them across bars.
+    """
+
+    def __init__(self, tickers, capacity=256, fields=FIELDS, dtype=np.float64):
+        self.tickers = list(dict.fromkeys(tickers))
+        self.index = {ticker: row for row, ticker in enumerate(self.tickers)}
+        self.fields = tuple(fields)
+        self.dtype = dtype
+        self.length = 0
+        self.dates = []
+        self._times = np.full(max(capacity, 1), np.datetime64("NaT"), dtype="datetime64[s]")
+        self._columns = {
+            field: np.full((len(self.tickers), max(capacity, 1)), np.nan, dtype=dtype)
+            for field in self.fields
+        }
+
+    @classmethod
+    def from_ohlcv(cls, ohlcv, tickers=None):
+        """Build a history from a Surmount ``data["ohlcv"]`` list in one pass."""
+        if tickers is None:
+            tickers = list(dict.fromkeys(ticker for bar in ohlcv for ticker in bar))
+        history = cls(tickers, capacity=len(ohlcv))
+        history.extend(ohlcv)
+        return history
+
+    @classmethod
+    def from_arrays(cls, tickers, columns, dates, times=None):
+        """
+        Wrap existing (tickers x bars) arrays, e.g. ones backed by shared memory,
+        without copying them. ``columns`` maps field name -> array; ``times`` is
+        parsed from ``dates`` when not given.
+        """
+        history = cls.__new__(cls)
+        history.tickers = list(tickers)
+        history.index = {ticker: row for row, ticker in enumerate(history.tickers)}
+        history.fields = tuple(columns)
+        history._columns = dict(columns)
+        history.dtype = history._columns[history.fields[0]].dtype
+        history.dates = dates if isinstance(dates, Sequence) else list(dates)
+        history.length = len(history.dates)
+        history._times = parse_dates(history.dates) if times is None else times
+        return history
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, field):
+        return self.matrix(field)
+
+    @property
+    def capacity(self):
+        return self._columns[self.fields[0]].shape[1]
+
+    def add_tickers(self, tickers):
+        """Add rows for new tickers; their earlier bars read as NaN."""
+        new = [ticker for ticker in dict.fromkeys(tickers) if ticker not in self.index]
+        if not new:
+            return
+        rows = len(self.tickers) + len(new)
+        for field, column in self._columns.items():
+            if column.shape[0] < rows:
+                # Grow rows geometrically too, so a steady trickle of additions stays cheap
+                grown = np.full((max(rows, 2 * column.shape[0]), column.shape[1]), np.nan, dtype=self.dtype)
+                grown[:column.shape[0]] = column
+                self._columns[field] = grown
+        for ticker in new:
+            self.index[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+
+    def drop_tickers(self, tickers):
+        """Remove tickers and their history, compacting the remaining rows."""
+        dropped = set(tickers) & set(self.index)
+        if not dropped:
+            return
+        keep = [row for ticker, row in self.index.items() if ticker not in dropped]
+        for field, column in self._columns.items():
+            compacted = np.full(column.shape, np.nan, dtype=self.dtype)
+            compacted[:len(keep)] = column[keep]
+            self._columns[field] = compacted
+        self.tickers = [ticker for ticker in self.tickers if ticker not in dropped]
+        self.index = {ticker: row for row, ticker in enumerate(self.tickers)}
+
+    def _grow(self, needed):
+        capacity = max(needed, 2 * self.capacity)
+        for field, column in self._columns.items():
+            grown = np.full((column.shape[0], capacity), np.nan, dtype=self.dtype)
+            grown[:, :self.length] = column[:, :self.length]
+            self._columns[field] = grown
+        times = np.full(capacity, np.datetime64("NaT"), dtype="datetime64[s]")
+        times[:self.length] = self._times[:self.length]
+        self._times = times
+
+    def append(self, bar, date=None):
+        """
+        Append one Surmount-style bar: ``{ticker: {"open": ..., "close": ..., "date": ...}}``.
+        ``date`` defaults to the first quote's "date".
+        """
+        if self.length == self.capacity:
+            self._grow(self.length + 1)
+        col = self.length
+        for ticker, row in self.index.items():
+            quote = bar.get(ticker)
+            if not quote:
+                continue  # Missing tickers stay NaN for this bar
+            for field in self.fields:
+                value = quote.get(field)
+                if value is not None:
+                    self._columns[field][row, col] = value
+            if date is None:
+                date = quote.get("date")
+        self.dates.append(date)
+        # Parse the timestamp once here so lookups never touch the string again
+        self._times[col] = to_datetime64(date)
+        self.length += 1
+
+    def extend(self, bars):
+        for bar in bars:
+            self.append(bar)
+
+    def bar(self, col):
+        """Rebuild bar ``col`` in the Surmount ohlcv shape, skipping tickers with no close."""
+        bar = {}
+        closes = self._columns["close"]
+        for ticker, row in self.index.items():
+            if np.isnan(closes[row, col]):
+                continue  # Ticker not trading on this bar
+            quote = {field: float(self._columns[field][row, col]) for field in self.fields}
+            quote["date"] = self.dates[col]
+            bar[ticker] = quote
+        return bar
+
+    def to_ohlcv(self):
+        return [self.bar(col) for col in range(self.length)]
+
+    def window(self, start, stop=None):
+        """Bars ``[start, stop)`` as a ``PriceHistory`` of views onto this one's arrays."""
+        stop = self.length if stop is None else stop
+        columns = {field: self.matrix(field)[:, start:stop] for field in self.fields}
+        return PriceHistory.from_arrays(self.tickers, columns, self.dates[start:stop], self.times[start:stop])
+
+    def replay(self):
+        """
+        Shallow copy sharing this history's arrays, rewound to zero bars.
+        Advancing it is just ``replayed.length += 1``; nothing is copied.
+        """
+        replayed = copy.copy(self)
+        replayed.length = 0
+        return replayed
+
+    @property
+    def times(self):
+        """Parsed bar timestamps as a read-only ``datetime64[s]`` view."""
+        view = self._times[:self.length]
+        view.flags.writeable = False
+        return view
+
+    def bar_index_at_or_before(self, date):
+        """
+        Index of the latest bar stamped at or before ``date`` (a date string,
+        ``datetime`` or ``datetime64``), found by binary search. None if every
+        bar is later.
+        """
+        index = int(np.searchsorted(self._times[:self.length], to_datetime64(date), side="right")) - 1
+        return index if index >= 0 else None
+
+    def series(self, ticker, field="close"):
+        """Zero-copy view of ``field`` for ``ticker`` over every bar seen so far."""
+        view = self._columns[field][self.index[ticker], :self.length]
+        view.flags.writeable = False
+        return view
+
+    def matrix(self, field="close"):
+        """Zero-copy (tickers x bars) view of ``field``; rows follow ``self.tickers``."""
+        view = self._columns[field][:len(self.tickers), :self.length]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def opens(self):
+        return FieldView(self, "open")
+
+    @property
+    def highs(self):
+        return FieldView(self, "high")
+
+    @property
+    def lows(self):
+        return FieldView(self, "low")
+
+    @property
+    def closes(self):
+        return FieldView(self, "close")
+
+    @property
+    def volumes(self):
+        return FieldView(self, "volume")
+
+
+class BarView(Mapping):
+    """
+    Bar ``col`` of a ``PriceHistory`` in the Surmount ``{ticker: quote}``
+    shape. Only the quotes actually looked up are built, so
+    ``ohlcv[i]["SPY"]["close"]`` costs one small dict rather than a whole bar.
+    Like ``series`` views it reads the live arrays, so don't keep it across a
+    resize of a growing history.
+    """
+
+    def __init__(self, history, col):
+        self._history = history
+        self._col = col
+
+    def __getitem__(self, ticker):
+        history = self._history
+        row = history.index.get(ticker)
+        if row is None or np.isnan(history._columns["close"][row, self._col]):
+            raise KeyError(ticker)
+        quote = {field: float(history._columns[field][row, self._col]) for field in history.fields}
+        quote["date"] = history.dates[self._col]
+        return quote
+
+    def __contains__(self, ticker):
+        row = self._history.index.get(ticker)
+        return row is not None and not np.isnan(self._history._columns["close"][row, self._col])
+
+    def _present(self):
+        history = self._history
+        return ~np.isnan(history._columns["close"][:len(history.tickers), self._col])
+
+    def __iter__(self):
+        for ticker, present in zip(self._history.tickers, self._present()):
+            if present:
+                yield ticker
+
+    def __len__(self):
+        return int(self._present().sum())
+
+
+class OhlcvView(Sequence):
+    """
+    Read-only ``data["ohlcv"]``-shaped sequence over a ``PriceHistory``.
+
+    Bars are ``BarView``s built on access instead of dicts held in memory, so
+    a history opened from an on-disk store can be replayed without ever
+    materialising the full list of per-bar dicts.
+    """
+
+    def __init__(self, history):
+        self.history = history
+
+    def __len__(self):
+        return self.history.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [BarView(self.history, col) for col in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("OhlcvView index out of range")
+        return BarView(self.history, index)
+
+    def __iter__(self):
+        for col in range(len(self)):
+            yield BarView(self.history, col)
@@ -0,0 +1,227 @@
+"""
+Streaming versions of the ``surmount.technical_indicators`` the strategies use.
+
+``SMA(ticker, ohlcv, 200)[-1]`` recomputes the whole series on every bar just
+to read its last value. The classes below keep running state instead and cost
+O(1) per bar. The harness hands every strategy one shared engine as
+``data["indicators"]`` (next to ``data["history"]``); a strategy registers
+what it needs, catches the engine up and reads the latest values, keeping
+the Surmount call for when the key is absent (daf3f13f does this):
+
+    indicators = data.get("indicators")
+    if indicators is not None:
+        sma_200 = indicators.add("SMA", ticker, 200)
+        indicators.update(data["history"])
+        if sma_200.value is not None: ...
+
+Registering is idempotent, so strategies that ask for the same indicator
+share one instance, and one registered late is first fed every bar seen so
+far. ``value`` is None until enough bars have been seen, mirroring the
+empty or None results the Surmount functions return on short histories.
+``max_deviation`` checks the streaming values against the Surmount ones.
+"""
+import math
+from collections import deque
+
+import numpy as np
+
+from backtest.history import PriceHistory
+
+
+class SMA:
+    """Simple moving average of the close over ``length`` bars."""
+
+    def __init__(self, length):
+        self.length = length
+        self.value = None
+        self._window = deque(maxlen=length)
+        self._sum = 0.0
+        self._updates = 0
+
+    def update(self, high, low, close, volume):
+        if len(self._window) == self.length:
+            self._sum -= self._window[0]
+        self._window.append(close)
+        self._sum += close
+        self._updates += 1
+        # Re-sum once per window so float drift in the running sum can't build up
+        if self._updates % self.length == 0:
+            self._sum = math.fsum(self._window)
+        if len(self._window) == self.length:
+            self.value = self._sum / self.length
+
+
+class STDEV:
+    """Rolling sample standard deviation of the close, using a windowed Welford update."""
+
+    def __init__(self, length):
+        self.length = length
+        self.value = None
+        self._window = deque(maxlen=length)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, high, low, close, volume):
+        n = len(self._window)
+        if n < self.length:
+            delta = close - self._mean
+            self._mean += delta / (n + 1)
+            self._m2 += delta * (close - self._mean)
+        else:
+            # Window is full: swap the oldest close for the new one in place
+            oldest = self._window[0]
+            mean = self._mean + (close - oldest) / n
+            self._m2 += (close - oldest) * (close - mean + oldest - self._mean)
+            self._mean = mean
+        self._window.append(close)
+        if len(self._window) == self.length and self.length > 1:
+            self.value = math.sqrt(max(self._m2, 0.0) / (self.length - 1))
+
+
+class RSI:
+    """Relative strength index with Wilder smoothing, seeded by the first ``length`` changes."""
+
+    def __init__(self, length):
+        self.length = length
+        self.value = None
+        self._previous = None
+        self._count = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def update(self, high, low, close, volume):
+        if self._previous is None:
+            self._previous = close
+            return
+        change = close - self._previous
+        self._previous = close
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+        self._count += 1
+        if self._count <= self.length:
+            self._avg_gain += gain / self.length
+            self._avg_loss += loss / self.length
+            if self._count < self.length:
+                return
+        else:
+            self._avg_gain = (self._avg_gain * (self.length - 1) + gain) / self.length
+            self._avg_loss = (self._avg_loss * (self.length - 1) + loss) / self.length
+        if self._avg_loss == 0:
+            self.value = 100.0
+        else:
+            self.value = 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)
+
+
+class VWAP:
+    """Volume-weighted typical price over ``length`` bars, or since the first bar if ``length`` is None."""
+
+    def __init__(self, length=None):
+        self.length = length
+        self.value = None
+        self._window = deque(maxlen=length) if length else None
+        self._pv = 0.0
+        self._volume = 0.0
+
+    def update(self, high, low, close, volume):
+        typical = (high + low + close) / 3
+        pv = typical * volume
+        if self._window is not None:
+            if len(self._window) == self.length:
+                old_pv, old_volume = self._window[0]
+                self._pv -= old_pv
+                self._volume -= old_volume
+            self._window.append((pv, volume))
+        self._pv += pv
+        self._volume += volume
+        if self._window is not None and len(self._window) < self.length:
+            return
+        self.value = self._pv / self._volume if self._volume > 0 else typical
+
+
+INDICATORS = {"SMA": SMA, "STDEV": STDEV, "RSI": RSI, "VWAP": VWAP}
+
+
+class IndicatorEngine:
+    """
+    Set of streaming indicators fed from a ``PriceHistory``.
+
+    ``update`` consumes only the bars appended since the previous call, so it
+    is safe (and cheap) to call at the top of every ``run``.
+    """
+
+    def __init__(self):
+        self._indicators = {}
+        # Bars each indicator has consumed, so late registrations catch up on their own
+        self._seen = {}
+        self._length = 0
+
+    def add(self, kind, ticker, length):
+        """Register ``kind`` ("SMA", "STDEV", "RSI" or "VWAP") and return its live indicator."""
+        key = (kind, ticker, length)
+        if key not in self._indicators:
+            self._indicators[key] = INDICATORS[kind](length)
+            self._seen[key] = 0
+        return self._indicators[key]
+
+    def get(self, kind, ticker, length):
+        return self._indicators[(kind, ticker, length)]
+
+    def value(self, kind, ticker, length):
+        return self._indicators[(kind, ticker, length)].value
+
+    def reset(self):
+        """Drop all running state, e.g. before replaying a different history."""
+        for kind, ticker, length in list(self._indicators):
+            self._indicators[(kind, ticker, length)] = INDICATORS[kind](length)
+            self._seen[(kind, ticker, length)] = 0
+        self._length = 0
+
+    def update(self, history):
+        if history.length < self._length:
+            self.reset()
+        for col in range(min(self._seen.values(), default=history.length), history.length):
+            highs = history.matrix("high")[:, col]
+            lows = history.matrix("low")[:, col]
+            closes = history.matrix("close")[:, col]
+            volumes = history.matrix("volume")[:, col]
+            for key, indicator in self._indicators.items():
+                row = history.index.get(key[1])
+                if self._seen[key] > col or row is None or math.isnan(closes[row]):
+                    continue  # Already fed, or ticker not trading on this bar
+                indicator.update(float(highs[row]), float(lows[row]), float(closes[row]), float(volumes[row]))
+        for key in self._seen:
+            self._seen[key] = history.length
+        self._length = history.length
+
+
+def max_deviation(ohlcv, specs, functions, every=1, warmup=0):
+    """
+    Replay ``ohlcv`` bar by bar through an ``IndicatorEngine`` holding
+    ``specs`` [(kind, ticker, length)] and compare each ``value`` with
+    ``functions[kind](ticker, ohlcv[:bar + 1], length)[-1]`` (e.g. the
+    ``surmount.technical_indicators`` module's functions) every ``every``
+    bars from bar ``warmup`` on. Returns {spec: largest absolute difference};
+    a bar where only one side has a value counts as infinitely far off.
+    """
+    tickers = list(dict.fromkeys(ticker for _, ticker, _ in specs))
+    history = PriceHistory(tickers, capacity=len(ohlcv))
+    engine = IndicatorEngine()
+    for spec in specs:
+        engine.add(*spec)
+    worst = dict.fromkeys(specs, 0.0)
+    for bar, quotes in enumerate(ohlcv):
+        history.append(quotes)
+        engine.update(history)
+        if bar < warmup or (bar - warmup) % every:
+            continue
+        for kind, ticker, length in specs:
+            series = functions[kind](ticker, ohlcv[:bar + 1], length)
+            expected = series[-1] if series else None
+            if expected is not None and np.isnan(expected):
+                expected = None
+            value = engine.value(kind, ticker, length)
+            if (value is None) != (expected is None):
+                worst[(kind, ticker, length)] = math.inf
+            elif value is not None:
+                worst[(kind, ticker, length)] = max(worst[(kind, ticker, length)], abs(value - expected))
+    return worst
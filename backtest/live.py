@@ -0,0 +1,214 @@
+"""
+Asyncio runner that fans each closed bar out to several strategies at once.
+
+Every ``run`` call is offloaded to an executor, so a slow strategy neither
+blocks the event loop nor the others. By default each strategy lives in its
+own worker process (``executor="process"``): strategies are CPU-bound Python,
+which threads would serialise on the GIL. The instance is copied into its
+process once and keeps its state there; each call ships only the bars and
+alt data records that arrived since the previous one. ``executor="thread"`` runs the instances
+in place on a thread pool instead, for strategies that can't be pickled or
+mostly wait on I/O.
+
+Each strategy gets ``deadline`` seconds per bar; one that misses it keeps
+its previous allocation for that bar and is skipped on later bars until its
+overdue call finishes (a call can't be interrupted, so it isn't stacked up
+behind itself). Skipped bars are not replayed one by one: the next call sees
+them in ``ohlcv`` but ``run`` is called once, so state a strategy advances
+per call rather than per bar drifts by the bars it missed (8fb6908a's
+``self.count``, which rebalances every fifth call, shifts phase).
+``skipped`` counts those bars per strategy.
+
+    runner = LiveRunner(load_strategies("."), deadline=2.0)
+    async for date, allocations in runner.stream(ReplayFeed(ohlcv)):
+        submit_orders(allocations)
+
+``ReplayFeed`` plays a recorded ohlcv list back as a feed for testing
+without any network; a live feed is any async iterable of bar dicts.
+``changes`` yields ``AllocationDelta``s instead, so bars on which no weight
+moved by more than ``tolerance`` can be skipped downstream.
+"""
+import asyncio
+import pickle
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+
+from backtest.allocation import AllocationDiffer, weights_of
+from backtest.altdata import AltDataCache, AsOfRecords
+from backtest.dates import bar_date, to_datetime64
+from backtest.harness import data_keys, load_strategy
+from backtest.window import WindowView
+
+
+class ReplayFeed:
+    """Async iterable over recorded bars, optionally ``delay`` seconds apart."""
+
+    def __init__(self, ohlcv, delay=0.0):
+        self.ohlcv = ohlcv
+        self.delay = delay
+
+    async def __aiter__(self):
+        for bar in self.ohlcv:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield bar
+
+
+# Per-process state filled in by _init_worker
+_worker = {}
+
+
+def _init_worker(path, blob, lookback):
+    if path is not None:
+        # Register the strategy's module so the instance can be unpickled in a fresh process
+        load_strategy(path)
+    _worker.update(strategy=pickle.loads(blob), lookback=lookback, window=[], alt={})
+
+
+def _run_bars(bars, alt):
+    """
+    Append the bars and {key: records} published since the last call and run
+    the worker's strategy on the newest bar.
+    """
+    window = _worker["window"]
+    window.extend(bars)
+    lookback = _worker["lookback"]
+    data = {"ohlcv": WindowView(window, lookback) if lookback else window}
+    for key, records in alt.items():
+        published = _worker["alt"].setdefault(key, [])
+        published.extend(records)
+        data[key] = AsOfRecords(published, len(published))
+    return weights_of(_worker["strategy"].run(data))
+
+
+def _strategy_path(strategy):
+    """The ``main.py`` a strategy was loaded from by ``load_strategy``, or None for importable classes."""
+    module = type(strategy).__module__
+    return sys.modules[module].__file__ if module.startswith("strategy_") else None
+
+
+class LiveRunner:
+    """Evaluate several ``TradingStrategy`` instances concurrently on every bar of a feed."""
+
+    def __init__(self, strategies, deadline=5.0, workers=None, alt_data=None, tolerance=0.0, executor="process"):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown executor {executor!r}")
+        self.strategies = dict(strategies)
+        self.deadline = deadline
+        self.executor = executor
+        # Thread pool size; in process mode every strategy has a process of its own
+        self.workers = workers or len(self.strategies) or 1
+        self.alt_data = alt_data if alt_data is not None else AltDataCache()
+        self.window = []
+        self.lookbacks = {name: getattr(strategy, "lookback", None) for name, strategy in self.strategies.items()}
+        self.last = {name: {} for name in self.strategies}
+        self.differs = {name: AllocationDiffer(tolerance) for name in self.strategies}
+        self.errors = defaultdict(list)
+        self.timeouts = defaultdict(int)
+        self.skipped = defaultdict(int)
+        self.latency = defaultdict(list)
+        self._pending = {}
+        # Bars of the window and alt data records already shipped to each strategy's process
+        self._sent = {name: 0 for name in self.strategies}
+        self._sent_alt = {name: {key: 0 for key in data_keys(strategy)} for name, strategy in self.strategies.items()}
+
+    def _data(self, name, strategy, date):
+        # The window only ever grows, so a fixed-length view stays valid for an
+        # overdue call even after later bars have been appended
+        ohlcv = AsOfRecords(self.window, len(self.window))
+        data = {"ohlcv": WindowView(ohlcv, self.lookbacks[name]) if self.lookbacks[name] else ohlcv}
+        for key in data_keys(strategy):
+            data[key] = self.alt_data.at(key, date)
+        return data
+
+    def _call(self, name, strategy, date):
+        """(function, *args) that evaluates ``strategy`` on the current bar in its executor."""
+        if self.executor == "thread":
+            return strategy.run, self._data(name, strategy, date)
+        bars = self.window[self._sent[name]:]
+        self._sent[name] = len(self.window)
+        alt = {}
+        sent = self._sent_alt[name]
+        for key in sent:
+            published = self.alt_data.at(key, date)
+            alt[key] = published[sent[key]:]
+            sent[key] = max(sent[key], len(published))
+        return _run_bars, bars, alt
+
+    def _executors(self, stack):
+        """{strategy: executor}, entered on ``stack`` so they shut down with it."""
+        if self.executor == "thread":
+            pool = stack.enter_context(ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="strategy"))
+            return {name: pool for name in self.strategies}
+        return {
+            name: stack.enter_context(ProcessPoolExecutor(
+                1, initializer=_init_worker,
+                initargs=(_strategy_path(strategy), pickle.dumps(strategy), self.lookbacks[name]),
+            ))
+            for name, strategy in self.strategies.items()
+        }
+
+    async def _evaluate(self, loop, pool, name, call, date):
+        start = time.perf_counter()
+        future = loop.run_in_executor(pool, *call)
+        try:
+            # shield: on timeout the call keeps running and is only tracked as pending
+            allocation = await asyncio.wait_for(asyncio.shield(future), self.deadline)
+        except asyncio.TimeoutError:
+            self.timeouts[name] += 1
+            self._pending[name] = future
+            future.add_done_callback(lambda _: self._pending.pop(name, None))
+            return self.last[name]
+        except Exception as e:
+            self.errors[name].append((date, repr(e)))
+            return self.last[name]
+        finally:
+            self.latency[name].append(time.perf_counter() - start)
+        self.last[name] = weights_of(allocation)
+        return self.last[name]
+
+    async def on_bar(self, bar, loop, pools):
+        """
+        Run every strategy on ``bar`` in its executor from ``pools``
+        ({strategy: executor}); returns {strategy: {ticker: weight}} once all
+        have answered or timed out.
+        """
+        self.window.append(bar)
+        date = bar_date(bar)
+        stamp = to_datetime64(date)
+        names = []
+        tasks = []
+        for name, strategy in self.strategies.items():
+            if name in self._pending:
+                # Still busy with an earlier bar
+                self.skipped[name] += 1
+                continue
+            names.append(name)
+            tasks.append(self._evaluate(loop, pools[name], name, self._call(name, strategy, stamp), date))
+        results = dict(zip(names, await asyncio.gather(*tasks)))
+        return {name: results.get(name, self.last[name]) for name in self.strategies}
+
+    async def stream(self, feed):
+        """Yield ``(date, allocations)`` for every bar of ``feed``."""
+        loop = asyncio.get_running_loop()
+        with ExitStack() as stack:
+            pools = self._executors(stack)
+            async for bar in feed:
+                allocations = await self.on_bar(bar, loop, pools)
+                yield bar_date(bar), allocations
+
+    async def changes(self, feed):
+        """Yield ``(date, {strategy: AllocationDelta})`` for every bar of ``feed``."""
+        async for date, allocations in self.stream(feed):
+            yield date, {name: self.differs[name].diff(weights, date) for name, weights in allocations.items()}
+
+    async def run(self, feed, on_allocations=None):
+        """Consume ``feed``, passing each bar's allocations to ``on_allocations(date, allocations)`` if given."""
+        async for date, allocations in self.stream(feed):
+            if on_allocations is not None:
+                result = on_allocations(date, allocations)
+                if asyncio.iscoroutine(result):
+                    await result
@@ -0,0 +1,141 @@
+"""
+Buffered, level-filtered and rate-limited replacement for ``surmount.logging.log``.
+
+Strategies call ``log`` from their per-bar and per-ticker loops (8511c513 on
+every profit-take, a69c9681 on most bars), which over a long backtest means
+millions of synchronous writes. While a ``LogSink`` is attached, the ``log``
+each strategy module imported is swapped for the sink's:
+
+    sink = LogSink("backtest.log", level="INFO", rate=20, clock=lambda: harness.position)
+    with sink.attach(harness.strategies):
+        harness.run(ohlcv)
+    sink.close()
+
+A call below ``level`` returns after one comparison. Each call site may emit
+at most ``rate`` messages per unit of ``clock``; the rest are only counted
+and reported as one "suppressed" line. The default clock is wall-clock
+seconds, which suits a live runner; a backtest replays years in seconds, so
+there the clock should be the bar (``harness.position``, as above) or the
+simulated time, making the limit "per bar" and the output independent of
+how fast the machine is.
+
+Nothing is formatted on the calling thread: messages are queued with their
+arguments and formatted and written in batches by a background thread every
+``interval`` seconds, so arguments should not be objects the strategy
+mutates afterwards. Filtering and deferral only help if strategies pass
+arguments and levels rather than f-strings. The deployed ``log`` takes a
+single string, so modules that log per bar (a69c9681, 8511c513) wrap it in a
+module-level ``log(message, *args, level="INFO")`` that formats eagerly and
+is replaced by the sink's here:
+
+    log("Profit-taking on %s: +%.1f%%", ticker, change * 100)
+    log("CURRENT CPI :  %s", current_cpi, level="DEBUG")
+"""
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "OFF": 100}
+
+
+class LogSink:
+    """Asynchronous log sink writing to ``target`` (a path or a text stream, default stderr)."""
+
+    def __init__(self, target=None, level="INFO", rate=None, interval=0.5, max_buffer=100_000, clock=time.monotonic):
+        self.level = LEVELS[level] if isinstance(level, str) else level
+        self.rate = rate
+        self.clock = clock
+        self.interval = interval
+        self.max_buffer = max_buffer
+        self._owns_stream = isinstance(target, str)
+        self._stream = open(target, "a") if self._owns_stream else (target or sys.stderr)
+        self._queue = deque()
+        # call site -> [window start, messages emitted in window, messages suppressed]
+        self._sites = defaultdict(lambda: [None, 0, 0])
+        self.emitted = 0
+        self.suppressed = 0
+        self.dropped = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, name="log-sink", daemon=True)
+        self._thread.start()
+
+    def log(self, message, *args, level="INFO"):
+        severity = LEVELS[level]
+        if severity < self.level:
+            return
+        frame = sys._getframe(1)
+        site = (frame.f_code.co_filename, frame.f_lineno)
+        now = self.clock()
+        if self.rate is not None:
+            window = self._sites[site]
+            if window[0] is None or now - window[0] >= 1:
+                if window[2]:
+                    self._queue.append((now, "INFO", site, "suppressed %d similar messages", (window[2],)))
+                window[0], window[1], window[2] = now, 0, 0
+            if window[1] >= self.rate:
+                window[2] += 1
+                self.suppressed += 1
+                return
+            window[1] += 1
+        if len(self._queue) >= self.max_buffer:
+            # Never block the strategy on a slow stream; drop instead
+            self.dropped += 1
+            return
+        self._queue.append((now, level, site, message, args))
+        self.emitted += 1
+
+    def _format(self, entry):
+        _, level, (filename, lineno), message, args = entry
+        text = message % args if args else str(message)
+        return f"{level} {filename}:{lineno} {text}\n"
+
+    def flush(self):
+        """Format and write everything queued so far."""
+        lines = []
+        while self._queue:
+            lines.append(self._format(self._queue.popleft()))
+        if lines:
+            self._stream.write("".join(lines))
+            self._stream.flush()
+
+    def _flush_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Stop the background thread, report pending suppressions and flush."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        now = self.clock()
+        for site, window in self._sites.items():
+            if window[2]:
+                self._queue.append((now, "INFO", site, "suppressed %d similar messages", (window[2],)))
+                window[2] = 0
+        self.flush()
+        if self._owns_stream:
+            self._stream.close()
+
+    def stats(self):
+        return {"emitted": self.emitted, "suppressed": self.suppressed, "dropped": self.dropped}
+
+    @contextmanager
+    def attach(self, strategies):
+        """Route the ``log`` of every module behind ``{name: strategy}`` through this sink inside the ``with`` block."""
+        originals = {}
+        try:
+            for strategy in strategies.values():
+                module = sys.modules.get(type(strategy).__module__)
+                if module is None or module in originals or not hasattr(module, "log"):
+                    continue
+                originals[module] = module.log
+                module.log = self.log
+            yield self
+        finally:
+            for module, log in originals.items():
+                module.log = log
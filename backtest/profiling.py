@@ -0,0 +1,120 @@
+"""
+Opt-in instrumentation for strategy ``run`` calls and indicator calls.
+
+    profiler = Profiler()
+    frame = harness.run(ohlcv, profiler=profiler)
+    profiler.counters()                        # aggregated rows
+    profiler.write_collapsed("run.folded")     # flamegraph.pl / speedscope input
+
+While attached, every ``TradingStrategy.run`` and every SMA/STDEV/RSI/VWAP
+call made from a strategy module is timed and attributed to the strategy,
+ticker, length and history size, without editing the module. Everything is
+restored when the profiler detaches.
+"""
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from backtest.cache import INDICATOR_NAMES
+
+
+class Profiler:
+    """Aggregated timings plus collapsed stacks for one or more instrumented runs."""
+
+    def __init__(self):
+        # (strategy, indicator or None, ticker, length) -> [calls, seconds, max history size]
+        self.stats = defaultdict(lambda: [0, 0.0, 0])
+        # Collapsed stack ("strategy;run;RSI(NVDA, 14)") -> self time in seconds
+        self.stacks = defaultdict(float)
+        self._local = threading.local()
+
+    def _current(self):
+        return getattr(self._local, "strategy", None)
+
+    def _wrap_run(self, name, run):
+        def profiled_run(data):
+            self._local.strategy = name
+            self._local.child_time = 0.0
+            start = time.perf_counter()
+            try:
+                return run(data)
+            finally:
+                elapsed = time.perf_counter() - start
+                entry = self.stats[(name, None, None, None)]
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] = max(entry[2], len(data.get("ohlcv", ())))
+                self.stacks[f"{name};run"] += elapsed - self._local.child_time
+                self._local.strategy = None
+        return profiled_run
+
+    def _wrap_indicator(self, indicator, func):
+        def profiled(ticker, data, length, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(ticker, data, length, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                name = self._current() or "<outside run>"
+                entry = self.stats[(name, indicator, ticker, length)]
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] = max(entry[2], len(data))
+                self.stacks[f"{name};run;{indicator}({ticker}, {length})"] += elapsed
+                if self._current() is not None:
+                    self._local.child_time += elapsed
+        return profiled
+
+    @contextmanager
+    def attach(self, strategies):
+        """Instrument ``{name: strategy}`` for the duration of the ``with`` block."""
+        own_runs = {}
+        originals = {}
+        try:
+            for name, strategy in strategies.items():
+                own_runs[name] = strategy.__dict__.get("run")
+                strategy.run = self._wrap_run(name, strategy.run)
+                module = sys.modules.get(type(strategy).__module__)
+                if module is None or module in originals:
+                    continue
+                originals[module] = {}
+                for indicator in INDICATOR_NAMES:
+                    func = getattr(module, indicator, None)
+                    if func is not None:
+                        originals[module][indicator] = func
+                        setattr(module, indicator, self._wrap_indicator(indicator, func))
+            yield self
+        finally:
+            for name, run in own_runs.items():
+                if run is None:
+                    # Drop the instance attribute so the class's run is visible again
+                    del strategies[name].run
+                else:
+                    strategies[name].run = run
+            for module, funcs in originals.items():
+                for indicator, func in funcs.items():
+                    setattr(module, indicator, func)
+
+    def counters(self):
+        """One dict per (strategy, call, ticker, length), slowest first."""
+        rows = []
+        for (name, indicator, ticker, length), (calls, seconds, history) in self.stats.items():
+            rows.append({
+                "strategy": name,
+                "call": indicator or "run",
+                "ticker": ticker,
+                "length": length,
+                "calls": calls,
+                "total_s": seconds,
+                "mean_ms": seconds / calls * 1e3 if calls else 0.0,
+                "max_history": history,
+            })
+        return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+    def write_collapsed(self, path):
+        """Write Brendan Gregg's collapsed-stack format with microsecond sample counts."""
+        with open(path, "w") as f:
+            for stack, seconds in sorted(self.stacks.items()):
+                f.write(f"{stack} {max(int(round(seconds * 1e6)), 0)}\n")
@@ -0,0 +1,110 @@
+"""
+Streaming aggregation of intraday bars into higher timeframes.
+
+Lets a strategy run on a 1min/5min feed while keeping daily signals. A
+strategy lists the extra resolutions it wants with a plain property:
+
+    @property
+    def resample(self):
+        return ["1day"]
+
+and drivers then add ``data["ohlcv_1day"]`` next to the intraday
+``data["ohlcv"]``: every completed daily bar followed by today's bar so far.
+Each incoming bar only updates the running open/high/low/close/volume of the
+current bucket, so nothing is recomputed from the intraday history.
+"""
+from collections.abc import Sequence
+
+import numpy as np
+
+from backtest.dates import bar_date, to_datetime64
+
+INTERVAL_SECONDS = {
+    "1min": 60,
+    "5min": 5 * 60,
+    "15min": 15 * 60,
+    "30min": 30 * 60,
+    "1hour": 60 * 60,
+    "4hour": 4 * 60 * 60,
+    "1day": 24 * 60 * 60,
+}
+
+
+class BarAggregator:
+    """Folds a stream of bars into ``interval`` buckets (aligned to midnight UTC)."""
+
+    def __init__(self, interval="1day"):
+        self.interval = interval
+        self.seconds = INTERVAL_SECONDS[interval]
+        self.partial = None  # Bar being built for the current bucket
+        self._bucket = None
+
+    def update(self, bar):
+        """Fold in one bar; returns the bucket it closed, if it opened a new one, else None."""
+        stamp = to_datetime64(bar_date(bar)).astype(np.int64)
+        bucket = stamp // self.seconds
+        finished = None
+        if bucket != self._bucket:
+            finished = self.partial
+            self.partial = {}
+            self._bucket = bucket
+        start = str(np.datetime64(int(bucket * self.seconds), "s")).replace("T", " ")
+        for ticker, quote in bar.items():
+            current = self.partial.get(ticker)
+            if current is None:
+                current = dict(quote)
+                current["date"] = start
+                self.partial[ticker] = current
+                continue
+            current["high"] = max(current["high"], quote["high"])
+            current["low"] = min(current["low"], quote["low"])
+            current["close"] = quote["close"]
+            current["volume"] = current.get("volume", 0) + quote.get("volume", 0)
+        return finished
+
+
+class WithPartial(Sequence):
+    """Completed bars plus the in-progress one as the last element, without copying either."""
+
+    def __init__(self, completed, partial):
+        self._completed = completed
+        self._partial = partial
+
+    def __len__(self):
+        return len(self._completed) + (1 if self._partial else 0)
+
+    def __getitem__(self, index):
+        n = len(self)
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(n))]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("WithPartial index out of range")
+        return self._completed[index] if index < len(self._completed) else self._partial
+
+    def __iter__(self):
+        yield from self._completed
+        if self._partial:
+            yield self._partial
+
+
+class Resampler:
+    """Keeps completed bars for several target intervals and hands out ``WithPartial`` views."""
+
+    def __init__(self, intervals):
+        self.aggregators = {interval: BarAggregator(interval) for interval in intervals}
+        self.completed = {interval: [] for interval in intervals}
+
+    def update(self, bar):
+        for interval, aggregator in self.aggregators.items():
+            finished = aggregator.update(bar)
+            if finished:
+                self.completed[interval].append(finished)
+
+    def views(self):
+        """{"ohlcv_<interval>": completed bars + current partial bar} for the latest update."""
+        return {
+            f"ohlcv_{interval}": WithPartial(self.completed[interval], aggregator.partial)
+            for interval, aggregator in self.aggregators.items()
+        }
@@ -0,0 +1,275 @@
+"""
+Columnar store of backtest results, appended to bar by bar.
+
+A result store is a directory of flat binary columns, like the price store:
+
+    meta.json                    strategy and ticker dictionaries, row counts
+    bars.time.i64                one timestamp per bar
+    perf.<column>.bin            (bar, strategy, return, turnover, equity) per strategy-bar
+    weights.<column>.bin         (bar, strategy, ticker, weight) for every weight set
+    contrib.<column>.bin         (bar, strategy, ticker, value) return earned by each held position
+
+Strategies and tickers are stored as integer codes, so a growing universe
+only grows the dictionaries. Rows are buffered and flushed in chunks. A
+writer replaces any store already at its path unless opened with
+``append=True``, in which case it continues from the last bar recorded
+(bars must keep moving forward in time either way). Reading maps
+the columns with ``mmap``, and every analytic below is a NumPy reduction over
+them, so comparing many runs never unpickles Python objects:
+
+    harness.run(ohlcv, results=ResultWriter("runs/baseline"))
+    open_results("runs/baseline").summary()
+    compare({point: open_results(path) for point, path in runs.items()})
+
+Returns follow ``sweep.score``: weights chosen at the close of bar t earn the
+close-to-close return of bar t + 1.
+"""
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from backtest.cross_section import PERIODS_PER_YEAR
+from backtest.dates import parse_dates
+from backtest.store import _map
+
+VERSION = 1
+
+TABLES = {
+    "bars": {"time": np.int64},
+    "perf": {"bar": np.int32, "strategy": np.int16, "return": np.float64, "turnover": np.float64, "equity": np.float64},
+    "weights": {"bar": np.int32, "strategy": np.int16, "ticker": np.int32, "weight": np.float32},
+    "contrib": {"bar": np.int32, "strategy": np.int16, "ticker": np.int32, "value": np.float64},
+}
+
+
+def _file(path, table, column):
+    return os.path.join(path, f"{table}.{column}.bin")
+
+
+def _read_meta(path):
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta["version"] != VERSION:
+        raise ValueError(f"Unsupported result store version {meta['version']} in {path}")
+    return meta
+
+
+class ResultWriter:
+    """
+    Appends one bar of allocations at a time; ``close`` (or leaving the
+    ``with`` block) flushes and writes the metadata. An existing store at
+    ``path`` is truncated unless ``append`` is set, so re-running into the
+    same directory never doubles its rows.
+    """
+
+    def __init__(self, path, flush_every=256, append=False):
+        self.path = path
+        self.flush_every = flush_every
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "meta.json")
+        if append and os.path.exists(meta_path):
+            meta = _read_meta(path)
+            self.strategies = meta["strategies"]
+            self.tickers = meta["tickers"]
+            self.rows = meta["rows"]
+            self._state = meta["state"]
+        else:
+            self.strategies = []
+            self.tickers = []
+            self.rows = {table: 0 for table in TABLES}
+            # Carried between bars: last close per ticker, each strategy's held weights and equity, last bar time
+            self._state = {"closes": {}, "held": {}, "equity": {}, "time": None}
+            if os.path.exists(meta_path):
+                # Drop the old metadata first so a crash mid-run can't pair it with truncated columns
+                os.remove(meta_path)
+        self._strategy_codes = {name: code for code, name in enumerate(self.strategies)}
+        self._ticker_codes = {ticker: code for code, ticker in enumerate(self.tickers)}
+        self._buffers = {table: {column: [] for column in columns} for table, columns in TABLES.items()}
+        self._files = {
+            table: {column: open(_file(path, table, column), "ab" if append else "wb") for column in columns}
+            for table, columns in TABLES.items()
+        }
+        self._pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def bars(self):
+        return self.rows["bars"] + len(self._buffers["bars"]["time"])
+
+    def _code(self, codes, names, name):
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(names)
+            names.append(name)
+        return code
+
+    def _add(self, table, *values):
+        for column, value in zip(TABLES[table], values):
+            self._buffers[table][column].append(value)
+
+    def append(self, date, allocations, closes):
+        """
+        Record one bar: ``allocations`` {strategy: {ticker: weight}} chosen at
+        this bar and ``closes`` {ticker: close} (or a Surmount bar dict).
+        """
+        time = int(parse_dates([date])[0].astype(np.int64))
+        last = self._state.get("time")
+        if last is not None and time <= last:
+            raise ValueError(f"Bar {date!r} is not after the last recorded bar in {self.path}")
+        self._state["time"] = time
+        bar = self.bars
+        self._add("bars", time)
+        closes = {ticker: quote["close"] if isinstance(quote, dict) else quote for ticker, quote in closes.items()}
+        previous = self._state["closes"]
+        returns = {}
+        for ticker, close in closes.items():
+            before = previous.get(ticker)
+            if before and close is not None and not math.isnan(close):
+                returns[ticker] = close / before - 1
+        for name, weights in allocations.items():
+            strategy = self._code(self._strategy_codes, self.strategies, name)
+            held = self._state["held"].get(name, {})
+            earned = 0.0
+            for ticker, weight in held.items():
+                if weight and ticker in returns:
+                    value = weight * returns[ticker]
+                    earned += value
+                    self._add("contrib", bar, strategy, self._code(self._ticker_codes, self.tickers, ticker), value)
+            weights = {ticker: float(weight) for ticker, weight in weights.items() if weight == weight}
+            turnover = sum(abs(weights.get(ticker, 0.0) - held.get(ticker, 0.0)) for ticker in set(weights) | set(held))
+            equity = self._state["equity"].get(name, 1.0) * (1 + earned)
+            self._state["equity"][name] = equity
+            self._state["held"][name] = weights
+            self._add("perf", bar, strategy, earned, turnover, equity)
+            for ticker, weight in weights.items():
+                self._add("weights", bar, strategy, self._code(self._ticker_codes, self.tickers, ticker), weight)
+        previous.update((ticker, close) for ticker, close in closes.items() if close == close)
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        for table, columns in TABLES.items():
+            buffers = self._buffers[table]
+            for column, dtype in columns.items():
+                np.asarray(buffers[column], dtype=dtype).tofile(self._files[table][column])
+                self._files[table][column].flush()
+            self.rows[table] += len(buffers["time" if table == "bars" else "bar"])
+            for values in buffers.values():
+                values.clear()
+        self._pending = 0
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            "version": VERSION,
+            "strategies": self.strategies,
+            "tickers": self.tickers,
+            "rows": self.rows,
+            "state": self._state,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    def close(self):
+        if self._files is None:
+            return
+        self.flush()
+        for files in self._files.values():
+            for f in files.values():
+                f.close()
+        self._files = None
+
+
+class Results:
+    """Read-only, memory-mapped view of a result store with vectorised analytics."""
+
+    def __init__(self, path):
+        self.path = path
+        meta = _read_meta(path)
+        self.strategies = meta["strategies"]
+        self.tickers = meta["tickers"]
+        self.rows = meta["rows"]
+        self._tables = {}
+
+    def table(self, name):
+        """{column: array} of one table, mapped on first use."""
+        if name not in self._tables:
+            self._tables[name] = {
+                column: _map(_file(self.path, name, column), dtype, (self.rows[name],))
+                for column, dtype in TABLES[name].items()
+            }
+        return self._tables[name]
+
+    @property
+    def times(self):
+        return self.table("bars")["time"].view("datetime64[s]")
+
+    def _series(self, column):
+        """(strategies x bars) matrix of a perf column; NaN where a strategy has no row."""
+        perf = self.table("perf")
+        matrix = np.full((len(self.strategies), self.rows["bars"]), np.nan)
+        matrix[perf["strategy"], perf["bar"]] = perf[column]
+        return matrix
+
+    def equity(self):
+        return pd.DataFrame(self._series("equity").T, index=self.times, columns=self.strategies)
+
+    def returns(self):
+        return pd.DataFrame(self._series("return").T, index=self.times, columns=self.strategies)
+
+    def weights(self, strategy):
+        """(bars x tickers) weights of one strategy; NaN where no weight was set."""
+        table = self.table("weights")
+        mask = table["strategy"] == self.strategies.index(strategy)
+        tickers = np.unique(table["ticker"][mask])
+        matrix = np.full((self.rows["bars"], len(tickers)), np.nan, dtype=np.float32)
+        matrix[table["bar"][mask], np.searchsorted(tickers, table["ticker"][mask])] = table["weight"][mask]
+        return pd.DataFrame(matrix, index=self.times, columns=[self.tickers[code] for code in tickers])
+
+    def summary(self, periods_per_year=PERIODS_PER_YEAR):
+        """Total return, annualised Sharpe, max drawdown and mean turnover per strategy."""
+        equity = self._series("equity")
+        # Nothing is held going into the first bar, so its return doesn't count
+        returns = np.nan_to_num(self._series("return"))[:, 1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            peak = np.fmax.accumulate(equity, axis=1)
+            drawdown = np.nanmin(equity / peak - 1, axis=1) if equity.shape[1] else np.zeros(len(equity))
+            std = returns.std(axis=1)
+            sharpe = np.where(std > 0, returns.mean(axis=1) / std * np.sqrt(periods_per_year), 0.0)
+        last = equity[:, -1] if equity.shape[1] else np.ones(len(equity))
+        return pd.DataFrame({
+            "total_return": last - 1,
+            "sharpe": sharpe,
+            "max_drawdown": drawdown,
+            "turnover": np.nanmean(self._series("turnover"), axis=1) if equity.shape[1] else np.zeros(len(equity)),
+        }, index=pd.Index(self.strategies, name="strategy"))
+
+    def contributions(self):
+        """Return earned per (strategy, ticker), summed over the run."""
+        table = self.table("contrib")
+        keys = table["strategy"].astype(np.int64) * max(len(self.tickers), 1) + table["ticker"]
+        totals = np.bincount(keys, weights=table["value"], minlength=len(self.strategies) * len(self.tickers))
+        totals = totals.reshape(len(self.strategies), len(self.tickers))
+        strategy, ticker = np.nonzero(totals)
+        index = pd.MultiIndex.from_arrays(
+            [[self.strategies[i] for i in strategy], [self.tickers[i] for i in ticker]], names=["strategy", "ticker"]
+        )
+        return pd.Series(totals[strategy, ticker], index=index, name="contribution")
+
+
+def open_results(path):
+    return Results(path)
+
+
+def compare(runs):
+    """One ``summary`` row per (run, strategy) for {run name: ``Results``}."""
+    return pd.concat({name: results.summary() for name, results in runs.items()}, names=["run"])
@@ -0,0 +1,138 @@
+"""
+Stop-loss and profit-take rules backed by incremental trackers.
+
+Strategies rescan history for their stops: ``max(closes[-63:])`` in
+0f7e84e3, ``max(day[ticker]["high"] for day in ohlcv[-30:])`` in 317b0910,
+``max(prices[-63:])`` in 44e2a856. A ``RiskBook`` instead feeds each bar
+once into shared trackers (a monotonic-deque ``RollingExtremum`` per
+(ticker, field, window), a running peak when the window is None, a lag
+buffer for trailing returns), so every rule costs O(1) per bar.
+
+Strategies declare rules by ticker and window with a plain property
+
+    @property
+    def risk(self):
+        return {f"stop_{ticker}": ("STOP_LOSS", ticker, 63, 0.05) for ticker in self.tickers}
+
+and drivers pass ``data["risk"]`` as {name: triggered} for the current bar.
+As with ``signals``, strategies keep their inline rule for when it is absent.
+
+    ("STOP_LOSS", ticker, window, drop[, field])      (peak - close) / peak > drop, peak of ``field``
+                                                      over the last ``window`` bars (None: all bars)
+    ("PROFIT_TAKE", ticker, window, gain)             (close - close[-window]) / close[-window] > gain
+"""
+import math
+from collections import deque
+
+from backtest.window import RollingExtremum, RunningExtremum
+
+
+class TrailingReturn:
+    """``(value - value[-window]) / value[-window]`` over a stream, None until ``window`` values are seen."""
+
+    def __init__(self, window):
+        self.window = window
+        self._values = deque(maxlen=window)
+        self.value = None
+
+    def update(self, value):
+        if value != value:
+            return self.value
+        self._values.append(value)
+        if len(self._values) == self.window:
+            ago = self._values[0]
+            self.value = (value - ago) / ago
+        return self.value
+
+
+class StopLoss:
+    """Triggered once the close is more than ``drop`` below the peak of ``field`` over ``window`` bars."""
+
+    def __init__(self, ticker, window=None, drop=0.1, field="close"):
+        self.ticker = ticker
+        self.window = window
+        self.drop = drop
+        self.field = field
+
+    @property
+    def tracker(self):
+        return ("peak", self.ticker, self.field, self.window)
+
+    def triggered(self, book):
+        peak = book.trackers[self.tracker].value
+        close = book.closes.get(self.ticker)
+        if peak is None or close is None:
+            return False
+        return (peak - close) / peak > self.drop
+
+
+class ProfitTake:
+    """Triggered once the close is up more than ``gain`` on the close ``window`` bars back."""
+
+    def __init__(self, ticker, window, gain):
+        self.ticker = ticker
+        self.window = window
+        self.gain = gain
+
+    @property
+    def tracker(self):
+        return ("return", self.ticker, "close", self.window)
+
+    def triggered(self, book):
+        change = book.trackers[self.tracker].value
+        return change is not None and change > self.gain
+
+
+RULES = {"STOP_LOSS": StopLoss, "PROFIT_TAKE": ProfitTake}
+
+
+def make_rule(spec):
+    kind, *args = spec
+    return RULES[kind](*args)
+
+
+class RiskBook:
+    """Trackers shared by every rule attached to it, fed one bar at a time."""
+
+    def __init__(self):
+        self.trackers = {}
+        self.closes = {}
+        self._rules = {}
+
+    def add(self, rule, bars=()):
+        """
+        Attach a rule (or a spec tuple). A tracker it needs that doesn't exist
+        yet is first fed ``bars``, the bars seen so far, so late rules agree
+        with early ones.
+        """
+        if isinstance(rule, tuple):
+            if rule not in self._rules:
+                self._rules[rule] = make_rule(rule)
+            rule = self._rules[rule]
+        if rule.tracker not in self.trackers:
+            kind, _, field, window = rule.tracker
+            if kind == "return":
+                tracker = TrailingReturn(window)
+            elif window is None:
+                tracker = RunningExtremum("max")
+            else:
+                tracker = RollingExtremum(window, "max")
+            for bar in bars:
+                _feed(tracker, bar, rule.ticker, field)
+            self.trackers[rule.tracker] = tracker
+        return rule
+
+    def update(self, bar):
+        """Feed one Surmount-style bar to every tracker."""
+        for (_, ticker, field, _), tracker in self.trackers.items():
+            _feed(tracker, bar, ticker, field)
+        self.closes = {ticker: quote["close"] for ticker, quote in bar.items()}
+
+    def at(self, declared, bars=()):
+        """{name: triggered} for a strategy's declared {name: spec} on the current bar."""
+        return {name: self.add(spec, bars).triggered(self) for name, spec in declared.items()}
+
+
+def _feed(tracker, bar, ticker, field):
+    quote = bar.get(ticker)
+    tracker.update(quote[field] if quote is not None else math.nan)
@@ -0,0 +1,121 @@
+"""
+Rebalance schedules a strategy can declare so drivers skip off-schedule bars.
+
+A strategy opts in with a plain ``schedule`` property, which keeps its
+``main.py`` free of imports from this package:
+
+    @property
+    def schedule(self):
+        return "quarter_end"
+
+Accepted specs are "month_end", "quarter_end", "week_end", "every:N" (every
+Nth bar), "cron:<minute> <hour> <day> <month> <weekday>", an int (same as
+"every:N") or a ``Schedule`` instance. On bars where the schedule is not due
+the driver carries the previous ``TargetAllocation`` forward without calling
+``run``; the first bar always runs so there is something to carry.
+"""
+import datetime
+
+import numpy as np
+
+from backtest.dates import is_month_end, is_quarter_end, is_week_end
+
+
+class Schedule:
+    """Base class: decides per bar whether a strategy needs to run."""
+
+    def due(self, history, col):
+        """True if the strategy should run on bar ``col`` of ``history``."""
+        raise NotImplementedError
+
+
+class EveryNBars(Schedule):
+    """Every ``n``th bar, starting from bar ``offset``."""
+
+    def __init__(self, n, offset=0):
+        self.n = n
+        self.offset = offset
+
+    def due(self, history, col):
+        return col % self.n == self.offset % self.n
+
+
+class CalendarEnd(Schedule):
+    """Last business day of each week, month or quarter."""
+
+    CHECKS = {"week": is_week_end, "month": is_month_end, "quarter": is_quarter_end}
+
+    def __init__(self, period, holidays=None):
+        self.check = self.CHECKS[period]
+        self.holidays = holidays
+
+    def due(self, history, col):
+        return bool(self.check(history.times[col:col + 1], self.holidays)[0])
+
+
+class Cron(Schedule):
+    """
+    Five-field cron expression matched against each bar's timestamp (weekday
+    0 = Sunday). As in standard cron, when both day-of-month and day-of-week
+    are restricted (neither starts with "*") a bar matching either is due:
+    "0 16 1 * 1" fires on every 1st and on every Monday.
+    """
+
+    BOUNDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {expression!r}")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(field, low, high) for field, (low, high) in zip(fields, self.BOUNDS)
+        )
+        if 7 in self.weekdays:
+            self.weekdays.add(0)
+        self.either_day = not fields[2].startswith("*") and not fields[4].startswith("*")
+
+    @staticmethod
+    def _parse(field, low, high):
+        allowed = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step = part.split("/")
+                step = int(step)
+            if part == "*":
+                start, stop = low, high
+            elif "-" in part:
+                start, stop = (int(x) for x in part.split("-"))
+            else:
+                start = stop = int(part)
+            allowed.update(range(start, stop + 1, step))
+        return allowed
+
+    def due(self, history, col):
+        stamp = history.times[col]
+        if np.isnat(stamp):
+            return False
+        when = stamp.astype(datetime.datetime)
+        day = when.day in self.days
+        weekday = (when.weekday() + 1) % 7 in self.weekdays
+        return (
+            when.minute in self.minutes
+            and when.hour in self.hours
+            and when.month in self.months
+            and (day or weekday if self.either_day else day and weekday)
+        )
+
+
+def parse_schedule(spec):
+    """Turn a strategy's ``schedule`` value into a ``Schedule``; None means every bar."""
+    if spec is None or isinstance(spec, Schedule):
+        return spec
+    if isinstance(spec, int):
+        return EveryNBars(spec)
+    if spec in ("week_end", "month_end", "quarter_end"):
+        return CalendarEnd(spec[:-len("_end")])
+    if spec.startswith("every:"):
+        return EveryNBars(int(spec[len("every:"):]))
+    if spec.startswith("cron:"):
+        return Cron(spec[len("cron:"):])
+    raise ValueError(f"Unknown schedule {spec!r}")
@@ -0,0 +1,165 @@
+"""
+Regime signals evaluated for the whole backtest up front.
+
+Gating signals such as 698078a4's BTC VWAP regime depend only on prices, not
+on strategy state, so there is no need to rebuild them from the ohlcv window
+every bar. A strategy declares them with a plain property
+
+    @property
+    def signals(self):
+        return {"btc_vwap_200": ("VWAP", "BTC-USD", 200)}
+
+and drivers compute each distinct spec once as a vectorised series over the
+whole history (several specs in parallel), then pass ``data["signals"]``
+holding just the current bar's values. Series are cached on disk under a key
+hashed from the spec and the prices it reads, so a rerun over the same data
+only loads them. Strategies keep their inline computation for when
+``data["signals"]`` is absent, e.g. when deployed.
+
+Specs (bar offsets follow the strategies' ``prices[-n]`` idiom):
+
+    ("VWAP", ticker, length)                       rolling volume-weighted typical price
+    ("RETURN", ticker, lookback)                   (close - close[-lookback]) / close[-lookback]
+    ("RETURN_SPREAD", ticker, long_bars, days)     (close / close[-long_bars] - 1) - (close / close on or
+                                                   before ``days`` calendar days ago - 1)
+"""
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+FIELDS_USED = {
+    "VWAP": ("high", "low", "close", "volume"),
+    "RETURN": ("close",),
+    "RETURN_SPREAD": ("close",),
+}
+
+
+def _present(history, ticker, fields):
+    """Bar positions where ``ticker`` trades and its ``fields`` at those bars."""
+    row = history.index.get(ticker)
+    if row is None:
+        return np.empty(0, dtype=np.intp), {field: np.empty(0) for field in fields}
+    closes = history.matrix("close")[row]
+    present = np.flatnonzero(~np.isnan(closes))
+    return present, {field: history.matrix(field)[row, present].astype(float) for field in fields}
+
+
+def _scatter(bars, present, values):
+    """Spread per-present-bar values over all ``bars``, carrying the last one over bars without a quote."""
+    out = np.full(bars, np.nan)
+    if not len(present):
+        return out
+    filled = np.full(bars, -1)
+    filled[present] = np.arange(len(present))
+    filled = np.maximum.accumulate(filled)
+    out[filled >= 0] = values[filled[filled >= 0]]
+    return out
+
+
+def vwap(history, ticker, length):
+    present, columns = _present(history, ticker, FIELDS_USED["VWAP"])
+    typical = (columns["high"] + columns["low"] + columns["close"]) / 3
+    values = np.full(len(present), np.nan)
+    if len(present) >= length:
+        # Summing each window directly (rather than differencing cumulative sums)
+        # keeps long histories free of cancellation error
+        pv = sliding_window_view(typical * columns["volume"], length).sum(axis=1)
+        volume = sliding_window_view(columns["volume"], length).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values[length - 1:] = np.where(volume > 0, pv / volume, typical[length - 1:])
+    return _scatter(history.length, present, values)
+
+
+def trailing_return(history, ticker, lookback):
+    present, columns = _present(history, ticker, FIELDS_USED["RETURN"])
+    closes = columns["close"]
+    values = np.full(len(present), np.nan)
+    if len(present) >= lookback:
+        ago = closes[:len(closes) - lookback + 1]
+        values[lookback - 1:] = (closes[lookback - 1:] - ago) / ago
+    return _scatter(history.length, present, values)
+
+
+def return_spread(history, ticker, long_bars, days):
+    """
+    8fb6908a's regime measure. Unlike the others it is NaN wherever the
+    ticker has no quote on one of the three bars involved, as the strategy
+    then keeps its allocation.
+    """
+    values = np.full(history.length, np.nan)
+    row = history.index.get(ticker)
+    if row is None or history.length < long_bars:
+        return values
+    closes = history.matrix("close")[row].astype(float)
+    times = history.times
+    bars = np.arange(history.length)
+    # Most recent bar on or before ``days`` ago, else the first bar
+    past = np.maximum(np.searchsorted(times, times - np.timedelta64(days, "D"), side="right") - 1, 0)
+    today = closes[long_bars - 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = today / closes[past[long_bars - 1:]] - 1
+        lret = today / closes[bars[:len(bars) - long_bars + 1]] - 1
+    values[long_bars - 1:] = lret - ret
+    return values
+
+
+SIGNALS = {
+    "VWAP": vwap,
+    "RETURN": trailing_return,
+    "RETURN_SPREAD": return_spread,
+}
+
+
+def spec_key(history, spec):
+    """Hash of ``spec`` and of exactly the prices and timestamps it reads."""
+    kind, ticker = spec[0], spec[1]
+    digest = hashlib.sha1(repr(tuple(spec)).encode())
+    digest.update(np.ascontiguousarray(history.times).tobytes())
+    row = history.index.get(ticker)
+    if row is not None:
+        for field in FIELDS_USED[kind]:
+            digest.update(np.ascontiguousarray(history.matrix(field)[row]).tobytes())
+    return digest.hexdigest()
+
+
+class SignalStore:
+    """Precomputed signal series for one history, optionally cached as ``.npy`` files under ``root``."""
+
+    def __init__(self, history, root=None, workers=None):
+        self.history = history
+        self.root = os.path.expanduser(root) if root else None
+        if self.root:
+            os.makedirs(self.root, exist_ok=True)
+        self.workers = workers
+        self.series = {}
+        self.loaded = 0
+        self.computed = 0
+
+    def _compute(self, spec):
+        path = os.path.join(self.root, spec_key(self.history, spec) + ".npy") if self.root else None
+        if path and os.path.exists(path):
+            self.loaded += 1
+            return np.load(path)
+        values = SIGNALS[spec[0]](self.history, *spec[1:])
+        self.computed += 1
+        if path:
+            np.save(path, values)
+        return values
+
+    def precompute(self, specs):
+        """Evaluate every spec not yet held, several at once; NumPy releases the GIL for the heavy parts."""
+        missing = list(dict.fromkeys(tuple(spec) for spec in specs if tuple(spec) not in self.series))
+        if not missing:
+            return
+        with ThreadPoolExecutor(max_workers=self.workers or min(len(missing), os.cpu_count() or 1)) as pool:
+            for spec, values in zip(missing, pool.map(self._compute, missing)):
+                values.flags.writeable = False
+                self.series[spec] = values
+
+    def at(self, declared, bar):
+        """{name: value at ``bar``} for a strategy's declared {name: spec}; unknown specs are computed on first use."""
+        self.precompute(declared.values())
+        return {name: float(self.series[tuple(spec)][bar]) for name, spec in declared.items()}
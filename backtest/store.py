@@ -0,0 +1,125 @@
+"""
+Compact on-disk OHLCV store that is memory-mapped for replay.
+
+A store is a directory holding
+
+    meta.json       tickers, fields, dtype and bar count
+    time.i64        int64 epoch seconds, one per bar
+    <field>.bin     (bars x tickers) values of one field, float32 or float64
+
+That is 4-8 bytes per ticker-bar-field instead of a dict of dicts with a
+date string per ticker. Bars are laid out row by row so ``StoreWriter`` can
+append chunks of any size, and ``open_store`` maps every file with ``mmap``
+and returns a read-only ``PriceHistory`` whose views page data in on demand:
+
+    with StoreWriter("spy-1min", tickers, dtype=np.float32) as writer:
+        for chunk in vendor_chunks():
+            writer.append_bars(chunk)
+
+    history = open_store("spy-1min")
+    frame = harness.run(OhlcvView(history))
+"""
+import json
+import os
+from collections.abc import Sequence
+
+import numpy as np
+
+from backtest.history import FIELDS, PriceHistory
+
+VERSION = 1
+
+
+class DateStrings(Sequence):
+    """Surmount-style "%Y-%m-%d %H:%M:%S" strings formatted from a datetime64 array on access."""
+
+    def __init__(self, times):
+        self._times = times
+
+    def __len__(self):
+        return len(self._times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Still lazy, so slicing a long store's dates stays cheap
+            return DateStrings(self._times[index])
+        return str(self._times[index]).replace("T", " ")
+
+
+class StoreWriter:
+    """Appends bars to a store directory; ``close`` (or leaving the ``with`` block) writes the metadata."""
+
+    def __init__(self, path, tickers, fields=FIELDS, dtype=np.float64):
+        self.path = path
+        self.tickers = list(tickers)
+        self.fields = tuple(fields)
+        self.dtype = np.dtype(dtype)
+        self.bars = 0
+        os.makedirs(path, exist_ok=True)
+        self._time_file = open(os.path.join(path, "time.i64"), "wb")
+        self._files = {field: open(os.path.join(path, f"{field}.bin"), "wb") for field in self.fields}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, times, columns):
+        """Append a chunk: ``times`` (n,) and ``columns`` {field: (tickers x n) array}."""
+        times = np.asarray(times, dtype="datetime64[s]")
+        times.astype(np.int64).tofile(self._time_file)
+        for field, f in self._files.items():
+            # Stored bar-major so consecutive chunks are contiguous on disk
+            np.ascontiguousarray(np.asarray(columns[field]).T, dtype=self.dtype).tofile(f)
+        self.bars += len(times)
+
+    def append_bars(self, bars):
+        """Append a chunk of Surmount-style bar dicts."""
+        chunk = PriceHistory.from_ohlcv(bars, self.tickers)
+        self.append(chunk.times, {field: chunk.matrix(field) for field in self.fields})
+
+    def close(self):
+        if self._time_file.closed:
+            return
+        self._time_file.close()
+        for f in self._files.values():
+            f.close()
+        meta = {
+            "version": VERSION,
+            "tickers": self.tickers,
+            "fields": list(self.fields),
+            "dtype": self.dtype.str,
+            "bars": self.bars,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+
+def write_store(path, history, dtype=np.float64):
+    """Write a whole ``PriceHistory`` to a new store."""
+    with StoreWriter(path, history.tickers, history.fields, dtype) as writer:
+        writer.append(history.times, {field: history.matrix(field) for field in history.fields})
+
+
+def _map(path, dtype, shape):
+    if not np.prod(shape):
+        return np.empty(shape, dtype=dtype)  # mmap can't map an empty file
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+def open_store(path):
+    """Map a store read-only and return it as a ``PriceHistory`` covering every bar."""
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta["version"] != VERSION:
+        raise ValueError(f"Unsupported store version {meta['version']} in {path}")
+    bars = meta["bars"]
+    tickers = meta["tickers"]
+    times = _map(os.path.join(path, "time.i64"), np.int64, (bars,)).view("datetime64[s]")
+    columns = {
+        # Transposed view: (tickers x bars) like an in-memory history, still no copy
+        field: _map(os.path.join(path, f"{field}.bin"), np.dtype(meta["dtype"]), (bars, len(tickers))).T
+        for field in meta["fields"]
+    }
+    return PriceHistory.from_arrays(tickers, columns, DateStrings(times), times=times)
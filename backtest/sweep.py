@@ -0,0 +1,169 @@
+"""
+Parameter sweeps over a single strategy module.
+
+Tunable thresholds live as plain attributes set in each strategy's
+``__init__`` (``self.drawdown_stop``, ``self.trailing_stop``,
+``self.short_lookback``/``self.long_lookback``, ``self.profit_take``); a sweep
+point is a dict of attribute overrides applied to a fresh instance.
+
+The price data is copied once into a shared-memory block that every worker
+maps read-only and replays through an ``OhlcvView``, so nothing large is
+pickled per task or rebuilt as per-bar dicts in each worker. Finished points are
+appended to a JSON-lines file as they complete, and only a bounded number of
+tasks are in flight at a time so long sweeps don't pile up futures in memory.
+With ``results_root`` every point also writes a ``backtest.results`` store
+(named by a hash of its parameters) for later per-bar analysis.
+"""
+import hashlib
+import itertools
+import json
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from backtest.harness import Harness, load_strategy
+from backtest.history import OhlcvView, PriceHistory
+from backtest.results import ResultWriter
+
+PERIODS_PER_YEAR = 252
+
+
+def grid(space):
+    """Every combination of ``space`` ({name: [values, ...]})."""
+    names = list(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_points(space, n, seed=0):
+    """
+    ``n`` random points from ``space``. A list is sampled uniformly from its
+    items, a (low, high) tuple uniformly from that range (ints stay ints).
+    """
+    rng = random.Random(seed)
+    for _ in range(n):
+        point = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    point[name] = rng.randint(low, high)
+                else:
+                    point[name] = rng.uniform(low, high)
+            else:
+                point[name] = rng.choice(values)
+        yield point
+
+
+def score(weights, history):
+    """Total return, annualised Sharpe and max drawdown of a weights frame (bars x tickers)."""
+    closes = np.vstack([
+        history.series(ticker) if ticker in history.index else np.full(history.length, np.nan)
+        for ticker in weights.columns
+    ])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.nan_to_num(closes[:, 1:] / closes[:, :-1] - 1)
+    # Weights chosen at the close of bar t earn the return from t to t+1
+    held = np.nan_to_num(weights.to_numpy(dtype=float)[:-1].T)
+    portfolio = (held * returns).sum(axis=0)
+    equity = np.cumprod(1 + portfolio)
+    if not len(equity):
+        return {"total_return": 0.0, "sharpe": 0.0, "max_drawdown": 0.0}
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+    std = portfolio.std()
+    return {
+        "total_return": float(equity[-1] - 1),
+        "sharpe": float(portfolio.mean() / std * np.sqrt(PERIODS_PER_YEAR)) if std > 0 else 0.0,
+        "max_drawdown": float(drawdown.min()),
+    }
+
+
+# Per-process state filled in by _init_worker
+_worker = {}
+
+
+def _init_worker(shm_name, shape, dtype, tickers, fields, dates, strategy_path, alt_data, results_root):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    block = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    block.flags.writeable = False
+    history = PriceHistory.from_arrays(tickers, {field: block[i] for i, field in enumerate(fields)}, dates)
+    _worker.update(
+        shm=shm,
+        history=history,
+        # Bars are read straight off the shared block, never copied into dicts
+        ohlcv=OhlcvView(history),
+        module=load_strategy(strategy_path),
+        alt_data=alt_data,
+        results_root=results_root,
+    )
+
+
+def _run_point(params):
+    try:
+        strategy = _worker["module"].TradingStrategy()
+        for name, value in params.items():
+            if not hasattr(strategy, name):
+                raise AttributeError(f"Strategy has no parameter {name!r}")
+            setattr(strategy, name, value)
+        harness = Harness({"strategy": strategy})
+        writer = None
+        if _worker["results_root"]:
+            key = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+            # A rerun of the same point replaces its store rather than appending a second run to it
+            writer = ResultWriter(os.path.join(_worker["results_root"], key))
+        try:
+            frame = harness.run(_worker["ohlcv"], _worker["alt_data"], results=writer)
+        finally:
+            if writer is not None:
+                writer.close()
+        result = score(frame["strategy"] if len(frame.columns) else frame, _worker["history"])
+        result["errors"] = len(harness.errors["strategy"])
+        if writer is not None:
+            result["results"] = writer.path
+    except Exception as e:
+        result = {"error": repr(e)}
+    result["params"] = params
+    return result
+
+
+def sweep(strategy_path, points, ohlcv, out_path, alt_data=None, workers=None, max_pending=None, results_root=None):
+    """
+    Evaluate every parameter dict in ``points`` and append one JSON line per
+    point to ``out_path`` as results come in. Returns the number of points run.
+    """
+    history = PriceHistory.from_ohlcv(ohlcv)
+    block = np.stack([history.matrix(field) for field in history.fields])
+    shm = shared_memory.SharedMemory(create=True, size=max(block.nbytes, 1))
+    try:
+        np.ndarray(block.shape, dtype=block.dtype, buffer=shm.buf)[:] = block
+        initargs = (
+            shm.name, block.shape, block.dtype.str, history.tickers, history.fields,
+            history.dates, os.path.abspath(strategy_path), alt_data,
+            os.path.abspath(results_root) if results_root else None,
+        )
+        del block
+        workers = workers or os.cpu_count()
+        max_pending = max_pending or 2 * workers
+        done = 0
+        points = iter(points)
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as pool, \
+                open(out_path, "a") as out:
+            pending = set()
+            for point in itertools.chain(points, [None]):
+                if point is not None:
+                    pending.add(pool.submit(_run_point, point))
+                    if len(pending) < max_pending:
+                        continue
+                while pending and (point is None or len(pending) >= max_pending):
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        out.write(json.dumps(future.result()) + "\n")
+                        done += 1
+                    out.flush()
+        return done
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,274 @@
+"""
+Seeded synthetic market data for benchmarks, fuzzing and load tests.
+
+``SyntheticMarket`` simulates correlated geometric Brownian motion for any
+set of tickers. Every bar belongs to a market regime (bull, bear, chop) with
+its own drift and volatility; regimes last a geometric number of bars and
+then switch. Each ticker loads on a market factor, a sector factor and its
+own noise, so tickers in a sector move together. Known tickers get realistic
+profiles (SPY tracks the market, BIL barely moves, BTC-USD is several times
+more volatile); the rest get randomised ones.
+
+Bars are generated in fixed blocks of vectorised draws from one seeded
+generator, so the same seed gives the same prices however they are chunked:
+
+    market = SyntheticMarket(tickers, seed=7)
+    with StoreWriter("load-1000", market.tickers, dtype=np.float32) as writer:
+        for times, columns in market.chunks(5_000_000, size=50_000):
+            writer.append(times, columns)
+
+    history = market.history(20_000)            # in memory
+    ohlcv = history.to_ohlcv()                  # Surmount data["ohlcv"] list
+    alt = alt_feeds(data_keys(strategy), history.times, seed=7)
+
+``alt_feeds`` fakes the extra data sources strategies declare, in the record
+shape their ``run`` reads: quarterly ``("ratios", ticker)`` priceToBook,
+daily ``("5year_breakeven_inflation_rate",)`` values and a Poisson stream
+of ``("top_government_contracts",)`` / ``("top_lobbying_contracts",)``
+awards with a ticker and an amount. Each feed is seeded from ``seed`` and a
+hash of its key, so it doesn't change when other keys are added, removed or
+reordered.
+"""
+import hashlib
+
+import numpy as np
+
+from backtest.altdata import TIME, AltDataCache
+from backtest.history import FIELDS, PriceHistory
+from backtest.resample import INTERVAL_SECONDS
+from backtest.store import DateStrings
+
+# name: (daily drift, daily volatility, mean length in days)
+REGIMES = {
+    "bull": (0.0006, 0.009, 250),
+    "bear": (-0.0012, 0.022, 60),
+    "chop": (0.0, 0.014, 120),
+}
+
+# ticker: (start price, volatility relative to the regime's, market beta)
+PROFILES = {
+    "SPY": (400.0, 1.0, 1.0),
+    "QQQ": (350.0, 1.3, 1.15),
+    "BIL": (91.5, 0.02, 0.0),
+    "TLT": (95.0, 0.9, -0.2),
+    "GLD": (180.0, 0.8, 0.05),
+    "BTC-USD": (30_000.0, 3.5, 0.4),
+    "ETH-USD": (2_000.0, 4.5, 0.45),
+    "URA": (25.0, 2.0, 0.9),
+}
+
+# Tickers the synthetic contract and lobbying feeds draw from
+CONTRACT_TICKERS = ["LMT", "RTX", "BA", "GD", "NOC", "PLTR", "MSFT", "AMZN"]
+
+
+class SyntheticMarket:
+    """
+    Correlated, regime-switching GBM bars for ``tickers``. ``correlation``
+    is the share of variance from the market factor for a beta-1 ticker,
+    ``sector_correlation`` the extra share shared within a sector; sectors
+    are taken from ``sectors`` ({ticker: name}) or assigned at random.
+    """
+
+    def __init__(self, tickers, seed=0, start="2000-01-03", interval="1day", regimes=REGIMES,
+                 correlation=0.35, sector_correlation=0.2, sectors=None, profiles=None, block=1024):
+        self.tickers = list(dict.fromkeys(tickers))
+        self.seed = seed
+        self.start = np.datetime64(start, "s")
+        self.interval = interval
+        self.block = block
+        self.regimes = list(regimes)
+        # Per-bar parameters; intraday bars scale drift by time and volatility by its square root
+        days = INTERVAL_SECONDS[interval] / INTERVAL_SECONDS["1day"]
+        drift, vol, length = (np.array(values, dtype=float) for values in zip(*regimes.values()))
+        self._drift = drift * days
+        self._vol = vol * np.sqrt(days)
+        self._stay = 1 / np.maximum(length / days, 1)
+
+        rng = np.random.default_rng([seed, 0])
+        profiles = {**PROFILES, **(profiles or {})}
+        count = len(self.tickers)
+        price = np.exp(rng.normal(np.log(50), 0.8, count))
+        scale = rng.lognormal(0.0, 0.3, count)
+        beta = np.clip(rng.normal(1.0, 0.25, count), 0.2, 1.8)
+        for row, ticker in enumerate(self.tickers):
+            if ticker in profiles:
+                price[row], scale[row], beta[row] = profiles[ticker]
+        if sectors is None:
+            groups = max(1, count // 25)
+            codes = rng.integers(0, groups, count)
+        else:
+            names = list(dict.fromkeys(sectors.get(ticker) for ticker in self.tickers))
+            codes = np.array([names.index(sectors.get(ticker)) for ticker in self.tickers])
+        self._price = price
+        self._scale = scale
+        self._sector = codes
+        self._sectors = int(codes.max()) + 1 if count else 0
+        self._market = np.sqrt(correlation) * beta
+        # Profiled tickers with no beta (cash, gold) don't get a sector either
+        self._sector_load = np.where(beta > 0.1, np.sqrt(sector_correlation), 0.0)
+        self._own = np.sqrt(np.maximum(1 - self._market ** 2 - self._sector_load ** 2, 0.05))
+        self._volume = rng.lognormal(np.log(1e6), 1.0, count)
+
+    def times(self, first, count):
+        """Timestamps of bars ``first`` .. ``first + count``: business days, or a 24/7 grid intraday."""
+        if self.interval == "1day":
+            day = self.start.astype("datetime64[D]")
+            days = np.busday_offset(day, np.arange(first, first + count), roll="forward")
+            return days.astype("datetime64[s]")
+        return self.start + np.arange(first, first + count) * np.timedelta64(INTERVAL_SECONDS[self.interval], "s")
+
+    def _blocks(self):
+        """Endless (regimes, columns) blocks of ``block`` bars continuing one path."""
+        rng = np.random.default_rng([self.seed, 1])
+        count, n = len(self.tickers), self.block
+        regime = int(rng.integers(len(self.regimes)))
+        left = int(rng.geometric(self._stay[regime]))
+        log_close = np.log(self._price)
+        while True:
+            regimes = np.empty(n, dtype=np.int8)
+            filled = 0
+            while filled < n:
+                if not left:
+                    if len(self.regimes) > 1:
+                        # Switch to one of the other regimes
+                        regime = (regime + 1 + int(rng.integers(len(self.regimes) - 1))) % len(self.regimes)
+                    left = int(rng.geometric(self._stay[regime]))
+                take = min(left, n - filled)
+                regimes[filled:filled + take] = regime
+                filled += take
+                left -= take
+            vol = self._scale[:, None] * self._vol[regimes]
+            shocks = (
+                self._market[:, None] * rng.standard_normal(n)
+                + self._sector_load[:, None] * rng.standard_normal((self._sectors, n))[self._sector]
+                + self._own[:, None] * rng.standard_normal((count, n))
+            )
+            # Ito-corrected so the drift is that of the price, not of its log
+            returns = self._drift[regimes] - vol ** 2 / 2 + vol * shocks
+            log_closes = log_close[:, None] + np.cumsum(returns, axis=1)
+            previous = np.concatenate([log_close[:, None], log_closes[:, :-1]], axis=1)
+            log_close = log_closes[:, -1]
+            close = np.exp(log_closes)
+            open_ = np.exp(previous + 0.25 * vol * rng.standard_normal((count, n)))
+            # Intrabar range grows with volatility; high/low always bracket open and close
+            high = np.maximum(open_, close) * np.exp(0.5 * vol * np.abs(rng.standard_normal((count, n))))
+            low = np.minimum(open_, close) * np.exp(-0.5 * vol * np.abs(rng.standard_normal((count, n))))
+            # Volume rises with the size of the move
+            surprise = np.abs(returns) / np.maximum(vol, 1e-12)
+            volume = np.floor(self._volume[:, None] * rng.lognormal(0.0, 0.3, (count, n)) * (0.5 + surprise))
+            yield regimes, {"open": open_, "high": high, "low": low, "close": close, "volume": volume}
+
+    def chunks(self, bars, size=None, regimes=False):
+        """
+        Yield ``(times, columns)`` chunks of up to ``size`` bars (default
+        ``block``) covering ``bars`` bars, with ``columns`` {field: (tickers x n)}
+        as ``StoreWriter.append`` takes them. With ``regimes``, each chunk
+        also carries the regime index of every bar (into ``self.regimes``).
+        """
+        size = size or self.block
+        blocks = self._blocks()
+        pending_regimes, pending = np.empty(0, dtype=np.int8), {field: np.empty((len(self.tickers), 0)) for field in FIELDS}
+        done = 0
+        while done < bars:
+            want = min(size, bars - done)
+            parts_regimes, parts = [pending_regimes], {field: [pending[field]] for field in FIELDS}
+            have = len(pending_regimes)
+            while have < want:
+                block_regimes, columns = next(blocks)
+                parts_regimes.append(block_regimes)
+                for field in FIELDS:
+                    parts[field].append(columns[field])
+                have += len(block_regimes)
+            joined_regimes = np.concatenate(parts_regimes)
+            joined = {field: np.concatenate(parts[field], axis=1) for field in FIELDS}
+            pending_regimes = joined_regimes[want:]
+            pending = {field: values[:, want:] for field, values in joined.items()}
+            chunk = (self.times(done, want), {field: values[:, :want] for field, values in joined.items()})
+            done += want
+            yield chunk + (joined_regimes[:want],) if regimes else chunk
+
+    def history(self, bars, dtype=np.float64):
+        """The first ``bars`` bars as one in-memory ``PriceHistory``."""
+        columns = {field: np.empty((len(self.tickers), bars), dtype=dtype) for field in FIELDS}
+        times = self.times(0, bars)
+        done = 0
+        for chunk_times, chunk in self.chunks(bars):
+            for field in FIELDS:
+                columns[field][:, done:done + len(chunk_times)] = chunk[field]
+            done += len(chunk_times)
+        return PriceHistory.from_arrays(self.tickers, columns, DateStrings(times), times=times)
+
+    def ohlcv(self, bars):
+        """The first ``bars`` bars as a Surmount ``data["ohlcv"]`` list."""
+        return self.history(bars).to_ohlcv()
+
+
+def _mean_reverting(rng, count, mean, phi, sigma, start):
+    """AR(1) path x[t] = mean + phi * (x[t-1] - mean) + sigma * e[t], vectorised within blocks of steps."""
+    out = np.empty(count)
+    x = start - mean
+    # Blocks short enough that phi ** -length stays well inside float range
+    length = int(min(256, max(1, -100 / np.log10(phi)))) if 0 < phi < 1 else 1
+    powers = phi ** np.arange(1, length + 1)
+    for first in range(0, count, length):
+        shocks = sigma * rng.standard_normal(min(length, count - first))
+        scale = powers[:len(shocks)]
+        # x[k] = phi^(k+1) * x0 + sum_j<=k phi^(k-j) * e[j]
+        path = scale * (x + np.cumsum(shocks / scale))
+        out[first:first + len(path)] = path
+        x = path[-1]
+    return out + mean
+
+
+def _ratios(rng, times, key, tickers):
+    # Fundamentals are published once a quarter
+    published = times[::63]
+    mean = np.log(rng.lognormal(np.log(2.5), 0.5))
+    values = np.exp(_mean_reverting(rng, len(published), mean, 0.8, 0.15, mean))
+    return published, {"priceToBook": values}
+
+
+def _breakeven(rng, times, key, tickers):
+    return times, {"value": _mean_reverting(rng, len(times), 2.2, 0.995, 0.03, 2.2)}
+
+
+def _awards(rng, times, key, tickers):
+    # A few awards per bar on average, each to one of ``tickers``
+    counts = rng.poisson(3, len(times))
+    published = np.repeat(times, counts)
+    picks = rng.integers(0, len(tickers), len(published))
+    amounts = np.round(rng.lognormal(np.log(1e6), 1.5, len(published)))
+    return published, {"ticker": np.array(tickers)[picks], "amount": amounts}
+
+
+def _walk(rng, times, key, tickers):
+    return times, {"value": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(times))))}
+
+
+FEEDS = {
+    "ratios": _ratios,
+    "5year_breakeven_inflation_rate": _breakeven,
+    "top_government_contracts": _awards,
+    "top_lobbying_contracts": _awards,
+}
+
+
+def alt_feeds(keys, times, seed=0, tickers=CONTRACT_TICKERS, cache=None):
+    """
+    Fake series for each data key in ``keys`` over bar ``times``, stored
+    column-wise in ``cache`` (a new ``AltDataCache`` by default), which the
+    harness takes as ``alt_data`` directly. Unknown sources get a random walk
+    under "value".
+    """
+    cache = cache if cache is not None else AltDataCache()
+    times = np.asarray(times, dtype="datetime64[s]")
+    for key in keys:
+        key = tuple(key)
+        # A stable digest, unlike hash(), which is salted per process for strings
+        digest = hashlib.sha1(repr(key).encode()).digest()
+        rng = np.random.default_rng([seed, 2, int.from_bytes(digest[:8], "little")])
+        published, fields = FEEDS.get(key[0], _walk)(rng, times, key, tickers)
+        columns = {TIME: published}
+        columns.update(fields)
+        cache.put_columns(key, columns)
+    return cache
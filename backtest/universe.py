@@ -0,0 +1,59 @@
+"""
+Ticker universes that change while a backtest runs.
+
+Strategies such as 8511c513 pick their tickers from alternative data each
+bar, so ``assets`` is not known up front. ``Universe`` keeps the set of
+tickers that are currently wanted: new members are added as soon as they
+appear and members that drop out are only retired after ``max_age`` bars
+without being requested, so a ticker that flickers in and out of a feed
+doesn't lose its price history.
+"""
+
+
+class Universe:
+    """Interned set of wanted tickers with age-based retirement."""
+
+    def __init__(self, tickers=(), max_age=21):
+        self.max_age = max_age
+        self.bar = 0
+        self._last_seen = {ticker: 0 for ticker in tickers}
+
+    @property
+    def active(self):
+        return list(self._last_seen)
+
+    def __contains__(self, ticker):
+        return ticker in self._last_seen
+
+    def __iter__(self):
+        return iter(self._last_seen)
+
+    def __len__(self):
+        return len(self._last_seen)
+
+    def update(self, members):
+        """
+        Record this bar's requested tickers and return ``(added, retired)``:
+        tickers seen for the first time, and tickers unrequested for more
+        than ``max_age`` bars, which are dropped from the universe.
+        """
+        self.bar += 1
+        added = self.request(members)
+        retired = []
+        for ticker, seen in self._last_seen.items():
+            if self.bar - seen <= self.max_age:
+                break
+            retired.append(ticker)
+        for ticker in retired:
+            del self._last_seen[ticker]
+        return added, retired
+
+    def request(self, tickers):
+        """Mark ``tickers`` as wanted on the current bar without ending it; returns the ones that are new."""
+        added = []
+        for ticker in tickers:
+            if self._last_seen.pop(ticker, None) is None:
+                added.append(ticker)
+            # Re-inserting keeps the dict ordered from least to most recently seen
+            self._last_seen[ticker] = self.bar
+        return added
@@ -0,0 +1,90 @@
+"""
+Walk-forward evaluation that resumes from checkpoints instead of replaying from bar 0.
+
+A fold is ``(start, split, stop)``: strategies warm up from bar ``start``
+(building their running peaks, cached allocations, counters, ...) and are
+scored on ``[split, stop)``. Folds sharing a ``start`` share that replay:
+it is advanced once through every split in order, and each fold's test
+window branches off a checkpoint taken at its split. With ``candidates``,
+every parameter dict is tried on the test window from the same checkpoint,
+so the warm-up is computed once per fold rather than once per candidate:
+
+    folds = rolling_folds(len(ohlcv), train=504, test=63, anchored=True)
+    results = walk_forward(lambda: {"s": load_strategy(path).TradingStrategy()},
+                           ohlcv, folds, candidates=grid({"profit_take": [0.3, 0.4]}))
+"""
+from collections import defaultdict
+
+from backtest.harness import Harness
+from backtest.history import PriceHistory
+from backtest.sweep import score
+
+
+def rolling_folds(bars, train, test, step=None, anchored=False):
+    """
+    ``(start, split, stop)`` folds over ``bars`` bars: ``train`` bars of
+    warm-up then ``test`` bars of evaluation, moving by ``step`` (default
+    ``test``). Anchored folds all start at bar 0.
+    """
+    step = step or test
+    folds = []
+    split = train
+    while split < bars:
+        folds.append((0 if anchored else split - train, split, min(split + test, bars)))
+        split += step
+    return folds
+
+
+def _apply(harness, params):
+    for strategy in harness.strategies.values():
+        for name, value in params.items():
+            if not hasattr(strategy, name):
+                raise AttributeError(f"Strategy has no parameter {name!r}")
+            setattr(strategy, name, value)
+
+
+def walk_forward(factory, ohlcv, folds, alt_data=None, candidates=None, history=None):
+    """
+    Evaluate ``folds`` and return one result per (fold, candidate) with the
+    fold bounds, the ``score`` of every strategy on the test window and the
+    parameters used. ``factory()`` returns fresh {name: strategy} instances;
+    it is called once per distinct fold start.
+    """
+    history = history if history is not None else PriceHistory.from_ohlcv(ohlcv)
+    candidates = list(candidates) if candidates else [{}]
+    by_start = defaultdict(list)
+    for fold in folds:
+        by_start[fold[0]].append(fold)
+
+    results = []
+    for start, group in sorted(by_start.items()):
+        harness = Harness(factory())
+        harness.start(ohlcv, alt_data, start)
+        group = sorted(group, key=lambda fold: fold[1])
+        for fold in group:
+            _, split, stop = fold
+            if harness.position > split:
+                # Overlapping folds: the previous test window ran past this split
+                harness.restore(checkpoint)
+            harness.advance(split)
+            checkpoint = harness.checkpoint()
+            for j, params in enumerate(candidates):
+                if j:
+                    harness.restore(checkpoint)
+                _apply(harness, params)
+                harness.advance(stop)
+                frame = harness.frame(split)
+                prices = history.window(split, stop)
+                results.append({
+                    "fold": fold,
+                    "params": params,
+                    "scores": {
+                        name: score(frame[name], prices)
+                        for name in frame.columns.get_level_values("strategy").unique()
+                    },
+                })
+            if candidates[-1]:
+                # Later folds continue with the strategies' own parameters
+                harness.restore(checkpoint)
+    return results
+
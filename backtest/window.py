@@ -0,0 +1,118 @@
+"""
+Bounded views of the ohlcv window for strategies that declare a lookback.
+
+A strategy that never looks further back than N bars can say so with a plain
+``lookback`` property. Drivers then hand ``run`` a ``WindowView`` of the last
+N bars instead of the whole history, and when every strategy declares one the
+bars themselves are kept in a fixed-size ``RingBuffer``, so memory and the
+cost of any full-window scan stay flat however long the backtest runs.
+
+Anything that really needs all-time state, such as the peak close used by
+drawdown stops, should track it incrementally (see ``RunningExtremum``, or
+``RollingExtremum`` for a peak over the last N bars) rather than scanning
+history.
+"""
+from collections import deque
+from collections.abc import Sequence
+
+
+class RingBuffer(Sequence):
+    """List-like buffer holding only the most recent ``capacity`` items."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._start = 0
+        self._size = 0
+
+    def append(self, item):
+        if self._size < self.capacity:
+            self._items[(self._start + self._size) % self.capacity] = item
+            self._size += 1
+        else:
+            self._items[self._start] = item
+            self._start = (self._start + 1) % self.capacity
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RingBuffer index out of range")
+        return self._items[(self._start + index) % self.capacity]
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._items[(self._start + i) % self.capacity]
+
+
+class WindowView(Sequence):
+    """Read-only view of the last ``size`` items of a list or ``RingBuffer``, without copying."""
+
+    def __init__(self, source, size):
+        self._source = source
+        self.size = size
+
+    def __len__(self):
+        return min(len(self._source), self.size)
+
+    def __getitem__(self, index):
+        n = len(self)
+        offset = len(self._source) - n
+        if isinstance(index, slice):
+            return [self._source[offset + i] for i in range(*index.indices(n))]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("WindowView index out of range")
+        return self._source[offset + index]
+
+    def __iter__(self):
+        source = self._source
+        for i in range(len(source) - len(self), len(source)):
+            yield source[i]
+
+
+class RunningExtremum:
+    """Running max (or min) of a stream, e.g. the all-time peak close for a drawdown stop."""
+
+    def __init__(self, mode="max"):
+        self._better = max if mode == "max" else min
+        self.value = None
+
+    def update(self, value):
+        if value == value:  # Ignore NaN
+            self.value = value if self.value is None else self._better(self.value, value)
+        return self.value
+
+
+class RollingExtremum:
+    """
+    Max (or min) of the last ``window`` values of a stream, kept in a
+    monotonic deque so each update is O(1) amortised. NaN values are skipped
+    without taking up a slot, like a ``[x for x in ohlcv if ticker in x]`` list.
+    """
+
+    def __init__(self, window, mode="max"):
+        self.window = window
+        self._keep = (lambda old, new: old > new) if mode == "max" else (lambda old, new: old < new)
+        self._items = deque()  # (position, value), values strictly monotonic
+        self._count = 0
+        self.value = None
+
+    def update(self, value):
+        if value != value:  # Ignore NaN
+            return self.value
+        items = self._items
+        while items and not self._keep(items[-1][1], value):
+            items.pop()
+        items.append((self._count, value))
+        self._count += 1
+        if items[0][0] <= self._count - 1 - self.window:
+            items.popleft()
+        self.value = items[0][1]
+        return self.value
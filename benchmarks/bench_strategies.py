@@ -0,0 +1,202 @@
+"""
+Per-bar run() latency benchmarks for every strategy module.
+
+Each ``TradingStrategy`` is replayed on its own through the backtest harness
+over seeded, correlated synthetic OHLCV from ``backtest.synthetic`` (plus
+fake ``Ratios``, breakeven inflation and government contract / lobbying
+feeds for the modules that use them) at several history lengths. For every
+module it reports p50/p99 per-bar latency, total backtest time, peak traced
+memory and the scaling exponent k in time ~ bars^k. Strategy ``log`` calls
+are routed to a ``LogSink`` at level "OFF" while timing, so neither the
+numbers nor the report depend on the terminal.
+
+    python benchmarks/bench_strategies.py                  # report only
+    python benchmarks/bench_strategies.py --save           # write baselines
+    python benchmarks/bench_strategies.py --check          # exit 1 on regressions
+
+``--check`` also replays the streaming ``backtest.indicators`` against the
+``surmount.technical_indicators`` functions and fails if they drift apart.
+    python benchmarks/bench_strategies.py --bars 500 2000 --modules 0f7e84e3
+
+Requires the ``surmount`` package, like the strategies themselves.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backtest.harness import Harness, data_keys, load_strategies  # noqa: E402
+from backtest.indicators import max_deviation  # noqa: E402
+from backtest.logsink import LogSink  # noqa: E402
+from backtest.synthetic import CONTRACT_TICKERS, SyntheticMarket, alt_feeds  # noqa: E402
+
+DEFAULT_BARS = (1000, 5000, 20000)
+DEFAULT_BASELINES = os.path.join(ROOT, "benchmarks", "baselines.json")
+
+
+def _timed(run, samples):
+    def wrapper(data):
+        start = time.perf_counter()
+        try:
+            return run(data)
+        finally:
+            samples.append(time.perf_counter() - start)
+    return wrapper
+
+
+def bench_module(name, bars, seed=0, memory=True):
+    """Replay one strategy module over ``bars`` synthetic bars and return its metrics."""
+    strategy = load_strategies(ROOT, [name])[name]
+    tickers = list(dict.fromkeys(list(strategy.assets) + CONTRACT_TICKERS))
+    history = SyntheticMarket(tickers, seed).history(bars)
+    ohlcv = history.to_ohlcv()
+    alt_data = alt_feeds(data_keys(strategy), history.times, seed)
+
+    samples = []
+    strategy.run = _timed(strategy.run, samples)
+    harness = Harness({name: strategy})
+    # Logging is dropped after one level comparison instead of printed synchronously
+    sink = LogSink(level="OFF")
+    with sink.attach(harness.strategies):
+        start = time.perf_counter()
+        harness.run(ohlcv, alt_data)
+        total = time.perf_counter() - start
+
+    peak_mb = None
+    if memory:
+        # Separate pass: tracing allocations would distort the latency numbers
+        strategy = load_strategies(ROOT, [name])[name]
+        with sink.attach({name: strategy}):
+            tracemalloc.start()
+            Harness({name: strategy}).run(ohlcv, alt_data)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+    sink.close()
+
+    latencies = np.array(samples) * 1e3
+    return {
+        "bars": bars,
+        "calls": len(samples),
+        "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+        "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+        "total_s": total,
+        "peak_mb": peak_mb,
+        "errors": len(harness.errors[name]),
+    }
+
+
+def check_indicators(seed=0, bars=500, tolerance=1e-4):
+    """Streaming indicators whose values differ from the Surmount functions by more than ``tolerance``."""
+    from surmount import technical_indicators
+
+    functions = vars(technical_indicators)
+    ohlcv = SyntheticMarket(["SPY", "NVDA"], seed).history(bars).to_ohlcv()
+    specs = [("SMA", "NVDA", 50), ("STDEV", "NVDA", 20), ("VWAP", "SPY", 10), ("VWAP", "SPY", 200)]
+    deviations = max_deviation(ohlcv, specs, functions, every=10)
+    # RSI implementations seed their averages differently, so compare once the seed has decayed
+    deviations.update(max_deviation(ohlcv, [("RSI", "NVDA", 14)], functions, every=10, warmup=200))
+    return [
+        f"{kind}({ticker}, {length}) streaming value off by {deviation:.3g}"
+        for (kind, ticker, length), deviation in deviations.items()
+        if deviation > tolerance
+    ]
+
+
+def scaling_exponent(runs):
+    """Slope of log(total time) against log(bars)."""
+    if len(runs) < 2:
+        return None
+    bars = np.log([run["bars"] for run in runs])
+    totals = np.log([max(run["total_s"], 1e-9) for run in runs])
+    return float(np.polyfit(bars, totals, 1)[0])
+
+
+def compare(results, baselines, tolerance):
+    """List of human-readable regressions of ``results`` against ``baselines``."""
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        old_runs = {run["bars"]: run for run in baseline["runs"]}
+        for run in result["runs"]:
+            old = old_runs.get(run["bars"])
+            if old is None:
+                continue
+            for metric in ("p99_ms", "total_s", "peak_mb"):
+                if run[metric] is None or old.get(metric) is None:
+                    continue
+                if run[metric] > old[metric] * (1 + tolerance):
+                    regressions.append(
+                        f"{name} @ {run['bars']} bars: {metric} {run[metric]:.3f} vs baseline {old[metric]:.3f}"
+                    )
+        if result["exponent"] is not None and baseline.get("exponent") is not None:
+            if result["exponent"] > baseline["exponent"] + tolerance:
+                regressions.append(
+                    f"{name}: scaling exponent {result['exponent']:.2f} vs baseline {baseline['exponent']:.2f}"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bars", type=int, nargs="+", default=list(DEFAULT_BARS))
+    parser.add_argument("--modules", nargs="+", help="Strategy directory names or prefixes (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baselines", default=DEFAULT_BASELINES)
+    parser.add_argument("--save", action="store_true", help="Write results as the new baselines")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a metric regresses beyond --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown (default 0.25)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    args = parser.parse_args(argv)
+
+    names = sorted(name for name in os.listdir(ROOT) if os.path.isfile(os.path.join(ROOT, name, "main.py")))
+    if args.modules:
+        names = [name for name in names if any(name.startswith(prefix) for prefix in args.modules)]
+
+    results = {}
+    for name in names:
+        runs = [bench_module(name, bars, args.seed, not args.no_memory) for bars in sorted(args.bars)]
+        results[name] = {"runs": runs, "exponent": scaling_exponent(runs)}
+        for run in runs:
+            peak = f"{run['peak_mb']:8.1f}" if run["peak_mb"] is not None else "       -"
+            print(
+                f"{name[:8]}  bars={run['bars']:>6}  p50={run['p50_ms']:9.3f}ms  p99={run['p99_ms']:9.3f}ms  "
+                f"total={run['total_s']:8.2f}s  peak={peak}MB  errors={run['errors']}"
+            )
+        exponent = results[name]["exponent"]
+        print(f"{name[:8]}  scaling exponent={exponent:.2f}" if exponent is not None else f"{name[:8]}")
+
+    status = 0
+    if args.check:
+        if not os.path.exists(args.baselines):
+            print(f"No baselines at {args.baselines}; run with --save first")
+            return 1
+        with open(args.baselines) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        regressions += check_indicators(args.seed)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        status = 1 if regressions else 0
+
+    if args.save:
+        baselines = {}
+        if os.path.exists(args.baselines):
+            with open(args.baselines) as f:
+                baselines = json.load(f)
+        baselines.update(results)
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Saved baselines to {args.baselines}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
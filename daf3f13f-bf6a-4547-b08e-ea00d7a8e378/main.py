@@ -5,6 +5,8 @@ from surmount.logging import log
 class TradingStrategy(Strategy):
     def __init__(self):
         self.tickers = ["TSM", "BABA", "TCEHY", "SE", "MELI", "AMX", "PBR"]
+        self.max_price = {}  # Running all-time high close per ticker
+        self.max_date = None  # Date of the newest bar folded into self.max_price
 
     @property
     def interval(self):
@@ -14,26 +16,54 @@ class TradingStrategy(Strategy):
     def assets(self):
         return self.tickers
 
+    @property
+    def lookback(self):
+        return 200  # 200-day SMA; the all-time high is tracked in self.max_price
+
     def run(self, data):
         ohlcv = data["ohlcv"]
         allocation = {ticker: 0 for ticker in self.tickers}
         total_weight = 0
-        max_price = {ticker: max([candle[ticker]['close'] for candle in ohlcv]) for ticker in self.tickers}
+        # Fold in every bar newer than the last one seen (the whole history on the
+        # first call), so bars skipped between calls still count towards the high
+        newer = 0
+        while newer < len(ohlcv) and (self.max_date is None or ohlcv[-1 - newer][self.tickers[0]]['date'] > self.max_date):
+            newer += 1
+        for i in range(len(ohlcv) - newer, len(ohlcv)):
+            for ticker in self.tickers:
+                close = ohlcv[i][ticker]['close']
+                self.max_price[ticker] = max(self.max_price.get(ticker, close), close)
+        if ohlcv:
+            self.max_date = ohlcv[-1][self.tickers[0]]['date']
+
+        # Streaming SMAs a backtest driver may pass as data["indicators"], O(1) per bar
+        indicators = data.get("indicators")
+        if indicators is not None:
+            for ticker in self.tickers:
+                indicators.add("SMA", ticker, 50)
+                indicators.add("SMA", ticker, 200)
+            indicators.update(data["history"])
 
         for ticker in self.tickers:
             if len(ohlcv) < 200:
                 continue  # Ensure sufficient data
 
-            sma_50 = SMA(ticker, ohlcv, 50)
-            sma_200 = SMA(ticker, ohlcv, 200)
+            if indicators is not None:
+                sma_50 = indicators.value("SMA", ticker, 50)
+                sma_200 = indicators.value("SMA", ticker, 200)
+            else:
+                sma_50 = SMA(ticker, ohlcv, 50)
+                sma_200 = SMA(ticker, ohlcv, 200)
+                sma_50 = sma_50[-1] if sma_50 else None
+                sma_200 = sma_200[-1] if sma_200 else None
 
-            if not sma_50 or not sma_200:
+            if sma_50 is None or sma_200 is None:
                 continue
 
             current_price = ohlcv[-1][ticker]['close']
             
             # Determine overweight or underweight based on SMA
-            if current_price > sma_50[-1] and current_price > sma_200[-1]:
+            if current_price > sma_50 and current_price > sma_200:
                 weight = 0.2  # Overweight allocation
             else:
                 weight = 0.1  # Underweight allocation
@@ -47,7 +77,7 @@ class TradingStrategy(Strategy):
                     weight = 0.1
 
             # Stop-loss rule
-            if current_price <= 0.8 * max_price[ticker]:
+            if current_price <= 0.8 * self.max_price[ticker]:
                 #log(f"Stop-loss: Trimming {ticker}")
                 weight = 0.1
 